@@ -1,228 +1,116 @@
-import requests
-from bs4 import BeautifulSoup
-import re
-from difflib import get_close_matches
+from concurrent.futures import ThreadPoolExecutor
 
-from database import BACTERIA_DATABASE
+import config
+from metrics import METRICS
+from core import (
+    STAGE_FULLTEXT,
+    STAGE_LOCAL,
+    STAGE_ONLINE,
+    PendingLookup,
+    complete_bacteria,
+    complete_online_lookup,
+    get_bacteria_info,
+    resolve_bacteria_locally
+)
+from online import get_http_client, get_result_cache, start_warmup
 from frontend import (
     setup_page,
     display_header,
     display_search_input,
+    display_suggestions,
     display_bacteria_info,
     display_online_info,
+    display_pending_lookup,
     display_error,
     display_examples,
-    display_footer
+    display_footer,
+    display_metrics_panel,
+    cache_lookup,
+    recall_last,
+    shared_resource,
+    store_last
 )
 
-def get_bacteria_info(input_name, database=BACTERIA_DATABASE):
-    """
-    Search for bacteria in database using name or common names with flexible matching
-    """
-    input_lower = input_name.lower().strip()
-    input_nodots = input_lower.replace(".", "").strip()
-    
-    for key, info in database.items():
-        # Check common names first since they include variations
-        if 'common_names' in info:
-            for name in info['common_names']:
-                name_lower = name.lower()
-                # Simple substring match
-                if input_lower in name_lower:
-                    return info
-                # Try matching without dots
-                name_nodots = name_lower.replace(".", "").strip()
-                if input_nodots in name_nodots:
-                    return info
-                    
-        # Then check the key and display name
-        if input_lower in key.lower() or input_lower in info['name'].lower():
-            return info
-    
-    return None
+def _resolve_locally_for_cache(query):
+    # Only runs when Streamlit's cache has no entry for query
+    METRICS.increment("bactopedia_cache_misses_total", cache="ui")
+    return resolve_bacteria_locally(query)
 
-def get_similar_bacteria(input_name, database=BACTERIA_DATABASE):
-    """
-    Find similar bacteria names from the database using fuzzy matching
-    """
-    input_lower = input_name.lower()
-    
-    # Create a list of all bacteria names (including variations)
-    all_names = []
-    for key, info in database.items():
-        all_names.append(key)
-        if 'common_names' in info:
-            all_names.extend(info['common_names'])
-    
-    # Get close matches
-    matches = get_close_matches(input_lower, all_names, n=3, cutoff=0.6)
-    return matches
+# Shared by every session so that repeat queries do no local lookup work at
+# all; online answers are cached by the online result cache instead
+resolve_locally_cached = cache_lookup(_resolve_locally_for_cache)
 
-def is_bacteria_related(query):
+@shared_resource
+def load_shared_resources():
     """
-    Check if the query appears to be bacteria-related
+    Create the HTTP client, online result cache and online lookup threads
+    once per process, so the first online lookup does not pay for their
+    setup, and start warming the cache for popular names in the background
     """
-    # Common bacteria-related terms and suffixes
-    bacteria_terms = [
-        'bacteria', 'bacterium', 'bacillus', 'coccus', 'vibrio', 
-        'streptococcus', 'staphylococcus', 'mycobacterium', 'clostridium',
-        'lactobacillus', 'pseudomonas', 'escherichia', 'helicobacter'
-    ]
-    
-    # Common scientific name patterns
-    scientific_patterns = [
-        r'\w+\s+\w+',  # Two-word scientific names
-        r'[A-Z]\.\s*\w+',  # Abbreviated genus (e.g., "E. coli")
-    ]
-    
-    query_lower = query.lower()
-    
-    # Check if query contains any bacteria-related terms
-    if any(term in query_lower for term in bacteria_terms):
-        return True
-        
-    # Check if query matches scientific name patterns
-    if any(re.match(pattern, query, re.IGNORECASE) for pattern in scientific_patterns):
-        return True
-        
-    # Check if query exists in our bacteria database
-    if any(query_lower in key.lower() or 
-           any(query_lower in common.lower() for common in info.get('common_names', []))
-           for key, info in BACTERIA_DATABASE.items()):
-        return True
-        
-    return False
+    resources = get_http_client(), get_result_cache(), ThreadPoolExecutor(
+        max_workers=config.UI_ONLINE_WORKERS, thread_name_prefix="bactopedia-ui-online"
+    )
+    start_warmup(skip=get_bacteria_info)
+    return resources
 
-def validate_input(bacteria_name):
-    """
-    Validate user input and return appropriate error messages
-    """
-    if not bacteria_name or bacteria_name.isspace():
-        return False, "Please enter a bacteria name."
-    
-    # Check for numbers or special characters
-    if any(char.isdigit() for char in bacteria_name):
-        return False, "Bacteria names typically don't contain numbers. Please check your input."
-    
-    if re.search(r'[^a-zA-Z\s\.-]', bacteria_name):
-        return False, "Invalid characters detected. Bacteria names usually only contain letters, spaces, dots, and hyphens."
-    
-    # Check if the query appears to be bacteria-related
-    if not is_bacteria_related(bacteria_name):
-        return False, "Please enter a valid bacteria name. Your query doesn't appear to be related to bacteria."
-    
-    return True, None
+def display_result(result):
+    """Display the outcome of a lookup"""
+    if result.online_error:
+        display_error(result.online_error)
 
-def search_bacteria_online(bacteria_name):
-    """
-    Search for bacteria information online using Wikipedia API
-    """
-    try:
-        # Add "bacteria" to the search query if it's not already present
-        search_term = bacteria_name
-        if "bacteria" not in bacteria_name.lower():
-            search_term = f"{bacteria_name} bacteria"
-            
-        search_url = "https://en.wikipedia.org/w/api.php"
-        search_params = {
-            "action": "query",
-            "format": "json",
-            "list": "search",
-            "srsearch": search_term,
-            "utf8": 1
-        }
-        
-        search_response = requests.get(search_url, params=search_params)
-        search_data = search_response.json()
-        
-        if "query" in search_data and search_data["query"]["search"]:
-            # Get the first result's page ID
-            page_id = search_data["query"]["search"][0]["pageid"]
-            
-            # Get the actual content
-            content_params = {
-                "action": "query",
-                "format": "json",
-                "pageids": page_id,
-                "prop": "extracts|info",
-                "exintro": True,
-                "explaintext": True,
-                "inprop": "url"
-            }
-            
-            content_response = requests.get(search_url, params=content_params)
-            content_data = content_response.json()
-            
-            if "query" in content_data and "pages" in content_data["query"]:
-                page = content_data["query"]["pages"][str(page_id)]
-                if "extract" in page and page["extract"].strip():
-                    # Verify the content is bacteria-related
-                    content_lower = page["extract"].lower()
-                    bacteria_indicators = [
-                        'bacteria', 'bacterium', 'gram-positive', 'gram-negative',
-                        'species', 'genus', 'pathogen', 'microorganism',
-                        'strain', 'culture', 'colony'
-                    ]
-                    
-                    if any(indicator in content_lower for indicator in bacteria_indicators):
-                        return {
-                            "name": page.get("title", bacteria_name.title()),
-                            "description": page["extract"],
-                            "source": "Wikipedia",
-                            "url": page.get("fullurl", f"https://en.wikipedia.org/?curid={page_id}")
-                        }
-    except Exception as e:
-        display_error(f"Error searching online: {str(e)}")
-    return None
+    if result.stage in (STAGE_LOCAL, STAGE_FULLTEXT):
+        display_bacteria_info(result.info)
+    elif result.stage == STAGE_ONLINE:
+        display_online_info(result.info)
+    else:
+        display_error(result.error)
 
 def main():
     """Main application logic"""
     # Set up the page
     setup_page()
     display_header()
+    online_executor = load_shared_resources()[2]
 
     # Get user input
     user_input = display_search_input()
 
     # Handle user input
+    online_lookup = None
     if user_input:
-        # First check local database
-        info = get_bacteria_info(user_input)
-        
-        if info:
-            display_bacteria_info(info)
+        # Offer the known names that the input is only the start of
+        completions = complete_bacteria(user_input, skip_exact=True)
+        if completions:
+            display_suggestions(completions)
+
+        # Local results are cached per input as typed, since did-you-mean
+        # names depend on the spelling; online answers are shared by every
+        # spelling through the online result cache. Reruns with an
+        # unchanged query reuse this session's last result
+        query = user_input
+        result = recall_last("last_lookup", query) or resolve_locally_cached(query)
+
+        if isinstance(result, PendingLookup):
+            # Show the local suggestions right away and search online in the
+            # background; the rest of the page is drawn before waiting
+            placeholder = display_pending_lookup(result.similar_names)
+            online_lookup = online_executor.submit(complete_online_lookup, result)
         else:
-            # If not in database, search online
-            online_info = search_bacteria_online(user_input)
-            
-            if online_info:
-                display_online_info(online_info)
-            else:
-                # Get validation result
-                is_valid, error_message = validate_input(user_input)
-                if not is_valid:
-                    display_error(error_message)
-                else:
-                    # Find similar bacteria names
-                    similar_names = get_similar_bacteria(user_input)
-                    
-                    error_message = "Sorry, I couldn't find information about that bacteria."
-                    
-                    if similar_names:
-                        error_message += "\n\nDid you mean one of these?"
-                        for name in similar_names:
-                            error_message += f"\n- {name.title()}"
-                    
-                    error_message += "\n\nSuggestions:"
-                    error_message += "\n- Check the spelling"
-                    error_message += "\n- Try using the scientific name (e.g., 'Escherichia coli' instead of 'E coli')"
-                    error_message += "\n- Try one of the example bacteria listed below"
-                    
-                    display_error(error_message)
+            store_last("last_lookup", query, result)
+            display_result(result)
 
     # Display examples and footer
     display_examples()
     display_footer()
 
+    if online_lookup is not None:
+        result = online_lookup.result()
+        with placeholder.container():
+            display_result(result)
+        store_last("last_lookup", query, result, keep=result.cacheable)
+
+    if config.METRICS_DEBUG_PANEL:
+        display_metrics_panel(METRICS.export_prometheus())
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,161 @@
+"""
+Resolve many bacteria names at once, outside of Streamlit.
+
+Usage:
+    python batch_lookup.py names.txt [-o results.jsonl] [--concurrency N] [--rate N]
+
+Each non-blank input line is one organism name. Results are written as JSON
+lines in the order they complete.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from core import STAGE_NOT_FOUND, PendingLookup, complete_online_lookup, resolve_bacteria_locally
+
+
+class RateLimiter:
+    """Space out calls so that at most `rate` of them start per second"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+# Names run through the local stages per trip to a worker thread; small
+# enough that other requests on the event loop are not held up for long
+_LOCAL_CHUNK_SIZE = 64
+
+# Reported when the online stage was skipped because Wikipedia kept failing
+_ONLINE_UNAVAILABLE = "Online search is temporarily unavailable."
+
+
+def _result(query, status, info=None, error=None):
+    return {"query": query, "status": status, "info": info, "error": error}
+
+
+def _lookup_result(query, result):
+    if result.online_error:
+        return _result(query, "error", error=result.online_error)
+    if result.stage == STAGE_NOT_FOUND and not result.cacheable:
+        return _result(query, "error", error=_ONLINE_UNAVAILABLE)
+    return _result(query, result.stage, dict(result.info) if result.info is not None else None, result.error)
+
+
+async def resolve_many(names, concurrency=config.BATCH_CONCURRENCY,
+                       rate_limit=config.BATCH_RATE_LIMIT, executor=None):
+    """
+    Resolve bacteria names, yielding one result dict per input name as soon
+    as it is known.
+
+    Every name first goes through the local stages of the resolver, as on
+    /lookup, and names they answer (including malformed ones) are yielded
+    immediately. Names with the same canonical form share a single online
+    lookup, and online lookups run concurrently with at most `concurrency`
+    in flight and at most `rate_limit` started per second.
+
+    Each result has "query" (the input name), "status" (the stage that
+    answered: "validation", "local", "fuzzy", "fulltext", "online" or
+    "not_found", or "error" when the online search failed or was skipped),
+    "info" and "error" (the message to show when nothing was found).
+
+    Lookups run on `executor`, such as the lookup service's shared thread
+    pool; without one, a pool of `concurrency` threads is created for the
+    batch.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(rate_limit)
+
+    def resolve_locally(chunk):
+        return [(name, resolve_bacteria_locally(name)) for name in chunk]
+
+    async def resolve_online(lookup, queries):
+        async with semaphore:
+            await limiter.acquire()
+            # Online errors are reported in the result rather than raised
+            result = await loop.run_in_executor(executor, complete_online_lookup, lookup)
+        return [_lookup_result(query, result) for query in queries]
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bactopedia-batch")
+    try:
+        # The local stages are CPU-bound (fuzzy matching above all), so they
+        # run on the executor a chunk at a time and the event loop can serve
+        # other requests between chunks
+        names = iter(names)
+        pending = {}
+        for chunk in iter(lambda: list(itertools.islice(names, _LOCAL_CHUNK_SIZE)), []):
+            for name, result in await loop.run_in_executor(executor, resolve_locally, chunk):
+                if isinstance(result, PendingLookup):
+                    pending.setdefault(result.query, (result, []))[1].append(name)
+                else:
+                    yield _lookup_result(name, result)
+
+        if not pending:
+            return
+
+        tasks = [asyncio.ensure_future(resolve_online(lookup, queries)) for lookup, queries in pending.values()]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                for result in await finished:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+    finally:
+        if own_executor:
+            # The generator is closed on the event loop when its consumer
+            # goes away (a /batch client disconnecting), so lookups still in
+            # flight are not waited for
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _write_results(names, output, concurrency, rate_limit):
+    async for result in resolve_many(names, concurrency=concurrency, rate_limit=rate_limit):
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve a file of bacteria names.")
+    parser.add_argument("input", help="file with one bacteria name per line, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSON lines output file (default: stdout)")
+    parser.add_argument("--concurrency", type=int, default=config.BATCH_CONCURRENCY,
+                        help="maximum online lookups in flight")
+    parser.add_argument("--rate", type=float, default=config.BATCH_RATE_LIMIT,
+                        help="maximum online lookups started per second (0 for no limit)")
+    args = parser.parse_args(argv)
+
+    if args.input == "-":
+        names = [line.strip() for line in sys.stdin if line.strip()]
+    else:
+        with open(args.input, encoding="utf-8") as source:
+            names = [line.strip() for line in source if line.strip()]
+
+    if args.output == "-":
+        asyncio.run(_write_results(names, sys.stdout, args.concurrency, args.rate))
+    else:
+        with open(args.output, "w", encoding="utf-8") as output:
+            asyncio.run(_write_results(names, output, args.concurrency, args.rate))
+
+
+if __name__ == "__main__":
+    main()
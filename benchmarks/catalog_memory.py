@@ -0,0 +1,76 @@
+"""
+Compare the memory held by a catalog as plain dicts and as a packed store.
+
+Usage:
+    python -m benchmarks.catalog_memory [--sizes 1000 10000 100000]
+
+For each size a synthetic catalog is loaded from JSON the way the source
+file is, and opened from a packed catalog file the way BACTERIA_DATABASE
+is. Reports the Python heap held by each (measured with tracemalloc) and
+the size of both files as JSON.
+"""
+import argparse
+import gc
+import json
+import os
+import tempfile
+import tracemalloc
+
+from database.catalog_store import CatalogStore, write_catalog
+
+from .synthetic import generate_catalog
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def _held_bytes(load):
+    """Return the object load() builds and the heap it still holds"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = load()
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return value, held
+
+
+def measure(size):
+    catalog = generate_catalog(size)
+    with tempfile.TemporaryDirectory() as directory:
+        source_path = os.path.join(directory, "bacteria.json")
+        catalog_path = os.path.join(directory, "bacteria.catalog")
+        with open(source_path, "w", encoding="utf-8") as f:
+            json.dump(catalog, f, indent=4)
+        write_catalog(catalog, catalog_path)
+        del catalog
+
+        def load_dicts():
+            with open(source_path, encoding="utf-8") as f:
+                return json.load(f)
+
+        dicts, dict_bytes = _held_bytes(load_dicts)
+        store, store_bytes = _held_bytes(lambda: CatalogStore(catalog_path))
+        # Both must describe the same catalog
+        key = next(iter(dicts))
+        assert store[key]["name"] == dicts[key]["name"]
+
+        return {
+            "entries": size,
+            "dict_heap_bytes": dict_bytes,
+            "store_heap_bytes": store_bytes,
+            "heap_ratio": round(store_bytes / dict_bytes, 3),
+            "source_file_bytes": os.path.getsize(source_path),
+            "catalog_file_bytes": os.path.getsize(catalog_path),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare catalog memory as dicts and as a packed store.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="catalog sizes to measure")
+    args = parser.parse_args(argv)
+    print(json.dumps([measure(size) for size in args.sizes], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Check that concurrent identical online lookups share one upstream fetch.
+
+Usage:
+    python -m benchmarks.coalescing [--processes 4] [--threads 16] [--names 5]
+                                    [--latency 0.3]
+
+Every thread of every process looks up the same names at the same moment
+through lookup_bacteria_online, against a slow local fake Wikipedia server
+that counts requests. It runs once per coalescing mode ("thread" and
+"process") with a fresh shared cache file. For each mode it reports the
+number of callers and upstream requests. Exits with status 1 if a mode
+sent more requests than it should: one per name and process for "thread",
+one per name for "process".
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+
+from .fake_wikipedia import FakeWikipedia
+
+
+def _worker(names, threads, barrier):
+    # Imported here so that the settings chosen by the parent apply
+    from online import lookup_bacteria_online
+
+    errors = []
+
+    def lookup(name):
+        try:
+            lookup_bacteria_online(name)
+        except Exception as e:
+            errors.append(e)
+
+    barrier.wait()
+    workers = [
+        threading.Thread(target=lookup, args=(name,))
+        for name in names
+        for _ in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    if errors:
+        raise errors[0]
+
+
+def run(mode, processes, threads, names, latency):
+    """Return the callers and upstream requests of one coalescing mode"""
+    context = multiprocessing.get_context("spawn")
+    with FakeWikipedia(latency=latency) as wiki, tempfile.TemporaryDirectory() as cache_dir:
+        os.environ.update(
+            BACTOPEDIA_WIKIPEDIA_API_URL=wiki.url,
+            BACTOPEDIA_CACHE_PATH=os.path.join(cache_dir, "results.sqlite3"),
+            BACTOPEDIA_CACHE_COALESCING=mode,
+            BACTOPEDIA_WARMUP="0",
+        )
+        barrier = context.Barrier(processes)
+        workers = [
+            context.Process(target=_worker, args=(names, threads, barrier))
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        if any(worker.exitcode for worker in workers):
+            raise RuntimeError(f"A lookup process failed in {mode} mode")
+
+    return {
+        "callers": processes * threads * len(names),
+        "upstream_requests": wiki.hits,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check coalescing of identical online lookups.")
+    parser.add_argument("--processes", type=int, default=4, help="processes sharing the cache file")
+    parser.add_argument("--threads", type=int, default=16, help="concurrent callers per name and process")
+    parser.add_argument("--names", type=int, default=5, help="distinct names looked up")
+    parser.add_argument("--latency", type=float, default=0.3, help="fake Wikipedia response delay in seconds")
+    args = parser.parse_args(argv)
+
+    names = [f"Trendia species{index}" for index in range(args.names)]
+    expected = {"thread": args.processes * args.names, "process": args.names}
+    results = {}
+    failed = False
+    for mode, limit in expected.items():
+        results[mode] = run(mode, args.processes, args.threads, names, args.latency)
+        results[mode]["expected_max"] = limit
+        if results[mode]["upstream_requests"] > limit:
+            print(f"FAIL {mode}: {results[mode]['upstream_requests']} upstream requests, "
+                  f"expected at most {limit}", file=sys.stderr)
+            failed = True
+
+    print(json.dumps(results, indent=2))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
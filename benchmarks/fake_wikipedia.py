@@ -0,0 +1,101 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FakeWikipedia:
+    """
+    Local stand-in for the Wikipedia API that answers generator=search
+    queries with a bacteria article after a fixed delay, counting requests.
+
+    Queries containing "unknown" get no results, so negative lookups can be
+    exercised as well. Setting `status` to an error code (e.g. 503) makes
+    every request fail with it, to exercise retries and the circuit breaker.
+
+        with FakeWikipedia(latency=0.05) as wiki:
+            config.WIKIPEDIA_API_URL = wiki.url
+    """
+
+    def __init__(self, latency=0.0, status=200, host="127.0.0.1", port=0):
+        self.latency = latency
+        self.status = status
+        self.hits = 0
+        self._hits_lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/w/api.php"
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this the
+            # client's delayed ACK adds ~40ms to every keep-alive response
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                with fake._hits_lock:
+                    fake.hits += 1
+                if fake.latency:
+                    time.sleep(fake.latency)
+
+                if fake.status != 200:
+                    body = json.dumps({"error": "unavailable"}).encode("utf-8")
+                else:
+                    params = parse_qs(urlparse(self.path).query)
+                    body = json.dumps(fake.respond(params)).encode("utf-8")
+                self.send_response(fake.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def respond(self, params):
+        """Build the JSON response for a set of query parameters"""
+        search = params.get("gsrsearch", params.get("srsearch", [""]))[0]
+        if "unknown" in search.lower():
+            return {"batchcomplete": ""}
+
+        title = search.replace(" bacteria", "").strip().title() or "Bacteria"
+        return {
+            "batchcomplete": "",
+            "query": {
+                "pages": {
+                    "1": {
+                        "pageid": 1,
+                        "index": 1,
+                        "title": title,
+                        "extract": f"{title} is a genus of Gram-negative bacteria.",
+                        "fullurl": f"https://en.wikipedia.org/wiki/{title.replace(' ', '_')}"
+                    }
+                }
+            }
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,85 @@
+"""
+Check that the lookup core starts quickly.
+
+Usage:
+    python -m benchmarks.import_budget [--budget-ms 40] [--runs 5] [--module core]
+
+Each module is imported in fresh interpreters under `python -X importtime`
+and the fastest cumulative import time is compared against the budget.
+The check also fails if the import loads a module that only the network,
+fuzzy-matching or UI paths need. Exits with status 1 on any failure.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Loaded only once a lookup actually needs them (or never, for the core)
+DEFERRED_MODULES = ["aiohttp", "bs4", "difflib", "multiprocessing", "online", "requests", "sqlite3", "streamlit"]
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_time_us(module):
+    """Return the cumulative import time of module, in microseconds, in a fresh interpreter"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=_ROOT, capture_output=True, text=True, check=True
+    )
+    # Lines look like "import time: self [us] | cumulative | imported package"
+    for line in completed.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].rstrip() == f" {module}":
+            return int(fields[1])
+    raise RuntimeError(f"No import time reported for {module}")
+
+
+def loaded_modules(module):
+    """Return the top-level names of every module loaded by importing module"""
+    completed = subprocess.run(
+        [sys.executable, "-c",
+         f"import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"],
+        cwd=_ROOT, capture_output=True, text=True, check=True
+    )
+    return {name.split(".")[0] for name in json.loads(completed.stdout)}
+
+
+def check_deferred(module):
+    """Return a human-readable violation for each deferred module that importing module loads"""
+    return [
+        f"importing {module} loads {name}, which should be imported on first use"
+        for name in sorted(loaded_modules(module).intersection(DEFERRED_MODULES))
+    ]
+
+
+def check(module, budget_ms, runs):
+    """Return a list of human-readable budget violations for module"""
+    problems = []
+    best_ms = min(import_time_us(module) for _ in range(runs)) / 1000
+    print(f"{module}: {best_ms:.1f} ms (budget {budget_ms:.1f} ms)", file=sys.stderr)
+    if best_ms > budget_ms:
+        problems.append(f"importing {module} took {best_ms:.1f} ms, over the {budget_ms:.1f} ms budget")
+
+    problems.extend(check_deferred(module))
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the cold import time of the lookup core.")
+    parser.add_argument("--module", action="append", help="module to check (default: core)")
+    parser.add_argument("--budget-ms", type=float, default=40.0, help="maximum cold import time")
+    parser.add_argument("--runs", type=int, default=5, help="imports measured; the fastest counts")
+    args = parser.parse_args(argv)
+
+    problems = []
+    for module in args.module or ["core"]:
+        problems.extend(check(module, args.budget_ms, args.runs))
+    for problem in problems:
+        print(f"FAIL {problem}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
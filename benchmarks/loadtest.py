@@ -0,0 +1,181 @@
+"""
+Load-test the headless lookup service.
+
+Usage:
+    python -m benchmarks.loadtest [--url http://127.0.0.1:8080] [--workers 4]
+                                  [--concurrency 64] [--requests 5000]
+
+Without --url a service is started on a free local port with --workers
+worker processes, against a local fake Wikipedia server. Requests are
+spread over /lookup (with the exact, alias, abbreviation, typo, junk and
+online-miss query mix of benchmarks.run), /suggest and /batch. Per-endpoint
+throughput, p50/p99 latency and status codes are written as JSON.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import aiohttp
+
+from database import BACTERIA_DATABASE
+
+from .fake_wikipedia import FakeWikipedia
+from .synthetic import generate_queries
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def build_requests(count, batch_size, seed=0):
+    """Return a shuffled list of (endpoint, query or names) requests"""
+    rng = random.Random(seed)
+    queries = [
+        query
+        for category in generate_queries(BACTERIA_DATABASE, count, seed=seed).values()
+        for query in category
+    ]
+
+    requests = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.8:
+            requests.append(("lookup", rng.choice(queries)))
+        elif roll < 0.98:
+            requests.append(("suggest", rng.choice(queries)))
+        else:
+            requests.append(("batch", rng.sample(queries, min(batch_size, len(queries)))))
+    return requests
+
+
+async def _send(session, url, endpoint, payload):
+    if endpoint == "batch":
+        async with session.post(f"{url}/batch", json={"names": payload}) as response:
+            await response.read()
+            return response.status
+    async with session.get(f"{url}/{endpoint}", params={"q": payload}) as response:
+        await response.read()
+        return response.status
+
+
+async def run_load(url, requests, concurrency):
+    """Send every request with at most concurrency in flight and summarize them"""
+    latencies = {}
+    statuses = {}
+    queue = iter(requests)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def worker():
+            for endpoint, payload in queue:
+                started = time.perf_counter_ns()
+                try:
+                    status = await _send(session, url, endpoint, payload)
+                except aiohttp.ClientError as e:
+                    status = type(e).__name__
+                latencies.setdefault(endpoint, []).append(time.perf_counter_ns() - started)
+                statuses.setdefault(endpoint, Counter())[str(status)] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    summary = {"requests": len(requests), "seconds": elapsed, "throughput_rps": len(requests) / elapsed}
+    for endpoint, values in latencies.items():
+        values.sort()
+        summary[endpoint] = {
+            "requests": len(values),
+            "p50_ms": _percentile(values, 0.50) / 1e6,
+            "p99_ms": _percentile(values, 0.99) / 1e6,
+            "statuses": dict(statuses[endpoint]),
+        }
+    return summary
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_healthy(url, process, timeout=60):
+    async def check():
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{url}/health") as response:
+                return response.status == 200
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("The service exited during startup")
+        try:
+            if asyncio.run(check()):
+                return
+        except aiohttp.ClientError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("The service did not become healthy in time")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the BACTO_PEDIA lookup service.")
+    parser.add_argument("--url", help="running service to test (default: start one locally)")
+    parser.add_argument("--workers", type=int, default=4, help="worker processes of the started service")
+    parser.add_argument("--concurrency", type=int, default=64, help="requests in flight")
+    parser.add_argument("--requests", type=int, default=5000, help="total requests sent")
+    parser.add_argument("--batch-size", type=int, default=50, help="names per /batch request")
+    parser.add_argument("--online-latency", type=float, default=0.02,
+                        help="fake Wikipedia response delay in seconds")
+    parser.add_argument("--output", default="-", help="JSON results file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    requests = build_requests(args.requests, args.batch_size)
+
+    if args.url:
+        summary = asyncio.run(run_load(args.url.rstrip("/"), requests, args.concurrency))
+    else:
+        with FakeWikipedia(latency=args.online_latency) as wiki, \
+                tempfile.TemporaryDirectory() as cache_dir:
+            port = _free_port()
+            url = f"http://127.0.0.1:{port}"
+            env = dict(
+                os.environ,
+                BACTOPEDIA_WIKIPEDIA_API_URL=wiki.url,
+                BACTOPEDIA_CACHE_PATH=os.path.join(cache_dir, "results.sqlite3"),
+                # The load test measures the service, not the upstream limit
+                BACTOPEDIA_BATCH_RATE_LIMIT="0",
+                # Keep background refreshes out of the measured upstream traffic
+                BACTOPEDIA_WARMUP="0",
+            )
+            process = subprocess.Popen(
+                [sys.executable, "-m", "service", "--port", str(port), "--workers", str(args.workers)],
+                env=env
+            )
+            try:
+                _wait_until_healthy(url, process)
+                summary = asyncio.run(run_load(url, requests, args.concurrency))
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+            summary["workers"] = args.workers
+            summary["upstream_requests"] = wiki.hits
+
+    encoded = json.dumps(summary, indent=2)
+    if args.output == "-":
+        print(encoded)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(encoded + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Benchmark the lookup hot paths against synthetic catalogs.
+
+Usage:
+    python -m benchmarks.run [--sizes 10 1000 10000 100000] [--queries 600]
+                             [--output results.json] [--baseline baseline.json]
+
+For each catalog size the query mix (exact, alias, abbreviation, typo, junk
+and online-miss queries) is replayed through get_bacteria_info,
+get_similar_bacteria, is_bacteria_related and validate_input, and its
+first four characters through complete_bacteria. The online
+path is replayed through search_bacteria_online against a local fake
+Wikipedia server, cold and warm. Results are written as JSON; with
+--baseline, any p50/p99 regression beyond --tolerance fails the run.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+# Keep benchmark runs away from the user's persistent result cache
+os.environ.setdefault("BACTOPEDIA_CACHE_PATH", ":memory:")
+
+import config
+import core
+from database import get_indexes
+from online import get_result_cache
+
+from .fake_wikipedia import FakeWikipedia
+from .synthetic import generate_catalog, generate_queries
+
+DEFAULT_SIZES = [10, 1000, 10000, 100000]
+
+
+def _percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(func, queries, track_memory=True):
+    """
+    Call func on every query and return latency and memory statistics.
+    Memory is measured in a separate pass so tracing does not skew timings.
+    """
+    for query in queries:
+        func(query)
+
+    gc.collect()
+    latencies = []
+    started = time.perf_counter()
+    for query in queries:
+        call_started = time.perf_counter_ns()
+        func(query)
+        latencies.append(time.perf_counter_ns() - call_started)
+    elapsed = time.perf_counter() - started
+
+    peak = None
+    if track_memory:
+        tracemalloc.start()
+        for query in queries:
+            func(query)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "queries": len(queries),
+        "p50_us": _percentile(latencies, 0.50) / 1000,
+        "p99_us": _percentile(latencies, 0.99) / 1000,
+        "mean_us": sum(latencies) / len(latencies) / 1000,
+        "throughput_qps": len(queries) / elapsed if elapsed else None,
+        "peak_kib": peak / 1024 if peak is not None else None,
+    }
+
+
+def measure_build(catalog):
+    """Time and trace building every index for catalog"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    get_indexes(catalog).build_all()
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_kib": peak / 1024}
+
+
+def benchmark_local(size, query_count):
+    catalog = generate_catalog(size, seed=size)
+    queries = generate_queries(catalog, query_count, seed=size)
+    all_queries = [query for category in queries.values() for query in category]
+
+    functions = {
+        "get_bacteria_info": lambda query: core.get_bacteria_info(query, database=catalog),
+        "get_similar_bacteria": lambda query: core.get_similar_bacteria(query, database=catalog),
+        "is_bacteria_related": lambda query: core.is_bacteria_related(query, database=catalog),
+        "validate_input": lambda query: core.validate_input(query, database=catalog),
+        "complete_bacteria": lambda query: core.complete_bacteria(query[:4], database=catalog),
+    }
+
+    results = {"build": measure_build(catalog)}
+    for name, func in functions.items():
+        result = measure(func, all_queries)
+        result["by_category"] = {
+            category: measure(func, category_queries, track_memory=False)
+            for category, category_queries in queries.items()
+        }
+        results[name] = result
+    return results
+
+
+def benchmark_online(query_count, latency):
+    catalog = generate_catalog(10, seed=0)
+    queries = generate_queries(catalog, query_count * 6, seed=0)["online_miss"]
+    # Half of the names are unknown upstream, exercising negative caching
+    queries = [
+        query if index % 2 else f"{query} unknown"
+        for index, query in enumerate(queries)
+    ]
+    cache = get_result_cache()
+
+    with FakeWikipedia(latency=latency) as wiki:
+        original_url = config.WIKIPEDIA_API_URL
+        config.WIKIPEDIA_API_URL = wiki.url
+        try:
+            cold = []
+            for query in queries:
+                cache.clear()
+                started = time.perf_counter_ns()
+                core.search_bacteria_online(query)
+                cold.append(time.perf_counter_ns() - started)
+            cold.sort()
+
+            warm = measure(core.search_bacteria_online, queries)
+        finally:
+            config.WIKIPEDIA_API_URL = original_url
+
+    return {
+        "search_bacteria_online": {
+            "upstream_latency_ms": latency * 1000,
+            "upstream_requests": wiki.hits,
+            "cold": {
+                "queries": len(cold),
+                "p50_us": _percentile(cold, 0.50) / 1000,
+                "p99_us": _percentile(cold, 0.99) / 1000,
+                "mean_us": sum(cold) / len(cold) / 1000,
+            },
+            "warm": warm,
+        }
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of human-readable regressions of results against baseline"""
+    regressions = []
+
+    def walk(current, previous, path):
+        for key, value in current.items():
+            if key not in previous:
+                continue
+            if isinstance(value, dict):
+                walk(value, previous[key], path + [key])
+            elif key in ("p50_us", "p99_us") and previous[key]:
+                if value > previous[key] * (1 + tolerance):
+                    regressions.append(
+                        f"{'/'.join(path + [key])}: {previous[key]:.1f} -> {value:.1f} "
+                        f"(+{(value / previous[key] - 1) * 100:.0f}%)"
+                    )
+
+    walk(results["results"], baseline.get("results", {}), [])
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark BACTO_PEDIA lookups.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="synthetic catalog sizes (number of species)")
+    parser.add_argument("--queries", type=int, default=600, help="queries replayed per catalog size")
+    parser.add_argument("--online-latency", type=float, default=0.02,
+                        help="fake Wikipedia response delay in seconds")
+    parser.add_argument("--output", default="-", help="JSON results file (default: stdout)")
+    parser.add_argument("--baseline", help="previous results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative p50/p99 slowdown before failing")
+    args = parser.parse_args(argv)
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "queries": args.queries,
+        },
+        "results": {},
+    }
+    for size in args.sizes:
+        print(f"Benchmarking catalog of {size} species...", file=sys.stderr)
+        results["results"][str(size)] = benchmark_local(size, args.queries)
+    print("Benchmarking online lookups...", file=sys.stderr)
+    results["results"]["online"] = benchmark_online(args.queries // 6, args.online_latency)
+
+    encoded = json.dumps(results, indent=2)
+    if args.output == "-":
+        print(encoded)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(encoded + "\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Measure how batch substring and fuzzy matching scale across processes.
+
+Usage:
+    python -m benchmarks.sharding [--size 100000] [--queries 200]
+                                  [--processes 1 2 4 8]
+
+A batch of alias, abbreviation and typo queries from a synthetic catalog
+is answered by the single-process BacteriaIndex and FuzzyIndex, then by a
+ShardedIndex with each number of processes (by default powers of two up to
+the number of CPUs). Reports the batch time, throughput and speedup of
+each run. Exits with status 1 if any run's results differ from the
+single-process ones.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from database import BacteriaIndex, FuzzyIndex, ShardedIndex, fold_query
+
+from .synthetic import generate_catalog, generate_queries
+
+
+def _default_processes():
+    counts = [1]
+    while counts[-1] * 2 <= (os.cpu_count() or 1):
+        counts.append(counts[-1] * 2)
+    return counts
+
+
+def _timed(func):
+    started = time.perf_counter()
+    value = func()
+    return value, time.perf_counter() - started
+
+
+def _summary(seconds, query_count, baseline_seconds=None):
+    summary = {"seconds": round(seconds, 3), "throughput_qps": round(query_count / seconds, 1)}
+    if baseline_seconds is not None:
+        summary["speedup"] = round(baseline_seconds / seconds, 2)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure sharded batch matching across processes.")
+    parser.add_argument("--size", type=int, default=100000, help="synthetic catalog size")
+    parser.add_argument("--queries", type=int, default=200, help="queries per batch")
+    parser.add_argument("--processes", type=int, nargs="+", default=_default_processes(),
+                        help="process counts to measure")
+    args = parser.parse_args(argv)
+
+    catalog = generate_catalog(args.size, seed=args.size)
+    mix = generate_queries(catalog, args.queries * 2, seed=args.size)
+    typed = (mix["alias"] + mix["abbreviation"] + mix["typo"])[:args.queries]
+    # Lookups take queries in canonical form, suggestions the lowercased input
+    queries = [fold_query(query) for query in typed]
+    fuzzy_queries = [query.lower() for query in typed]
+
+    lookup_index = BacteriaIndex(catalog)
+    fuzzy_index = FuzzyIndex.from_database(catalog)
+    expected_lookups, lookup_seconds = _timed(lambda: [lookup_index.lookup(query) for query in queries])
+    expected_suggestions, suggest_seconds = _timed(
+        lambda: [fuzzy_index.suggest(query, n=3, cutoff=0.6) for query in fuzzy_queries]
+    )
+    results = {
+        "catalog_size": args.size,
+        "queries": len(queries),
+        "cpus": os.cpu_count(),
+        "single_process": {
+            "lookup": _summary(lookup_seconds, len(queries)),
+            "suggest": _summary(suggest_seconds, len(queries)),
+        },
+        "sharded": {},
+    }
+
+    failed = False
+    for processes in args.processes:
+        with ShardedIndex(catalog, processes=processes) as index:
+            lookups, sharded_lookup_seconds = _timed(lambda: index.lookup_many(queries))
+            suggestions, sharded_suggest_seconds = _timed(lambda: index.suggest_many(fuzzy_queries))
+        matches = lookups == expected_lookups and suggestions == expected_suggestions
+        results["sharded"][processes] = {
+            "lookup": _summary(sharded_lookup_seconds, len(queries), lookup_seconds),
+            "suggest": _summary(sharded_suggest_seconds, len(queries), suggest_seconds),
+            "matches_single_process": matches,
+        }
+        if not matches:
+            print(f"FAIL {processes} processes: results differ from the single-process indexes", file=sys.stderr)
+            failed = True
+
+    print(json.dumps(results, indent=2))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Check offline mode against a generated snapshot pack.
+
+Usage:
+    python -m benchmarks.snapshot [--articles 10000] [--queries 2000]
+
+Builds a fixture pack from a synthetic catalog, then resolves its names,
+aliases and unknown names with BACTOPEDIA_ONLINE_MODE=offline. The Wikipedia
+URL points at a closed port, so any network use fails the check. Reports
+the latency of snapshot lookups next to local database lookups over a
+catalog of the same size. Exits with status 1 if any lookup returns the
+wrong article, or if a miss is not answered as "not found".
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+_PACK_DIR = tempfile.mkdtemp(prefix="bactopedia-snapshot-")
+os.environ.update(
+    BACTOPEDIA_ONLINE_MODE="offline",
+    BACTOPEDIA_SNAPSHOT_PATH=os.path.join(_PACK_DIR, "fixture.snapshot"),
+    BACTOPEDIA_WIKIPEDIA_API_URL="http://127.0.0.1:9/w/api.php",
+    BACTOPEDIA_CACHE_PATH=":memory:",
+    BACTOPEDIA_WARMUP="0",
+)
+
+import config
+import core
+from online import cache_key
+from online.snapshot import article_keys, write_snapshot
+
+from .run import measure
+from .synthetic import generate_catalog
+
+
+def build_fixture(catalog, path):
+    """Write a pack with one article per catalog entry and return the articles by key"""
+    articles = {}
+    for key, info in catalog.items():
+        articles[key] = {
+            "name": info["name"],
+            "description": info["description"].strip() * 4,
+            "source": "Wikipedia",
+            "url": f"https://en.wikipedia.org/wiki/{info['name'].replace(' ', '_')}",
+            "aliases": info["common_names"],
+        }
+    write_snapshot(((article, article_keys(article)) for article in articles.values()), path)
+    return articles
+
+
+def _unknown_names(count):
+    # Letters only, so that the names pass input validation
+    return [f"Zzunknownia {''.join(chr(97 + int(digit)) for digit in str(index))}" for index in range(count)]
+
+
+def check(catalog, articles, query_count, rng):
+    """Return a list of failures for names, aliases and misses"""
+    # Aliases such as a bare genus are shared; the first article claims them
+    owners = {}
+    for article in articles.values():
+        for key in article_keys(article):
+            owners.setdefault(key, article)
+
+    failures = []
+    for key in rng.sample(list(catalog), min(query_count, len(catalog))):
+        for query in (key, catalog[key]["name"].upper(), rng.choice(catalog[key]["common_names"]).title()):
+            owner = owners[cache_key(query)]
+            expected = {field: owner[field] for field in ("name", "description", "source", "url")}
+            found = core.search_bacteria_online(query)
+            if found != expected:
+                failures.append(f"{query!r} returned {found and found['name']!r}, expected {expected['name']!r}")
+
+    for query in _unknown_names(query_count // 10):
+        result = core.resolve_bacteria(query)
+        if result.stage != core.STAGE_NOT_FOUND or result.online_error is not None:
+            failures.append(f"miss {query!r} resolved as {result.stage}: {result.online_error}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check offline mode against a generated snapshot pack.")
+    parser.add_argument("--articles", type=int, default=10000, help="articles in the fixture pack")
+    parser.add_argument("--queries", type=int, default=2000, help="names looked up")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    try:
+        catalog = generate_catalog(args.articles)
+        articles = build_fixture(catalog, config.SNAPSHOT_PATH)
+        failures = check(catalog, articles, args.queries, rng)
+
+        queries = rng.sample(list(catalog), min(args.queries, len(catalog)))
+        queries += _unknown_names(len(queries) // 10)
+        results = {
+            "articles": len(articles),
+            "pack_bytes": os.path.getsize(config.SNAPSHOT_PATH),
+            "snapshot_lookup": measure(core.search_bacteria_online, queries, track_memory=False),
+            "local_lookup": measure(
+                lambda query: core.get_bacteria_info(query, database=catalog), queries, track_memory=False
+            ),
+            "failures": len(failures),
+        }
+    finally:
+        shutil.rmtree(_PACK_DIR, ignore_errors=True)
+
+    print(json.dumps(results, indent=2))
+    for failure in failures[:20]:
+        print(f"FAIL {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import random
+import string
+
+# Real genus names give the alias sets realistic shapes and shared prefixes
+GENERA = [
+    'acinetobacter', 'bacillus', 'bacteroides', 'bordetella', 'borrelia',
+    'campylobacter', 'chlamydia', 'clostridium', 'corynebacterium',
+    'enterobacter', 'enterococcus', 'escherichia', 'haemophilus',
+    'helicobacter', 'klebsiella', 'lactobacillus', 'legionella', 'listeria',
+    'mycobacterium', 'mycoplasma', 'neisseria', 'proteus', 'pseudomonas',
+    'salmonella', 'serratia', 'shigella', 'staphylococcus', 'streptococcus',
+    'treponema', 'vibrio', 'yersinia'
+]
+
+SYLLABLES = ['ae', 'an', 'ba', 'ci', 'co', 'do', 'fe', 'gi', 'la', 'li', 'ma',
+             'mo', 'ni', 'no', 'pa', 'ph', 'ra', 'ri', 'sa', 'ti', 'to', 'us', 'vi']
+
+SUFFIXES = ['us', 'is', 'ae', 'ensis', 'icum', 'oides', 'um', 'ata']
+
+FEATURES = [
+    'rod-shaped', 'spherical', 'spiral', 'motile', 'non-motile', 'spore-forming',
+    'aerobic', 'anaerobic', 'halophilic', 'thermophilic', 'pigmented',
+    'biofilm-forming', 'toxin-producing', 'nitrogen-fixing', 'opportunistic'
+]
+
+
+def _epithet(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) + rng.choice(SUFFIXES)
+
+
+def generate_catalog(size, seed=0):
+    """
+    Generate a catalog with the same shape as BACTERIA_DATABASE: binomial
+    keys, common names with abbreviated and dotless genus forms, and a short
+    multi-line description
+    """
+    rng = random.Random(seed)
+    catalog = {}
+    while len(catalog) < size:
+        genus = rng.choice(GENERA)
+        if rng.random() < 0.3:
+            # Extend the genus pool so large catalogs are not all congeners
+            genus = genus[:4] + "".join(rng.choices(string.ascii_lowercase, k=4))
+        species = _epithet(rng)
+        key = f"{genus} {species}"
+        if key in catalog:
+            continue
+
+        abbreviation = f"{genus[0]}. {species}"
+        common_names = [abbreviation, f"{genus[0]} {species}", f"{genus[0]}{species}"]
+        if rng.random() < 0.5:
+            common_names.append(genus)
+        if rng.random() < 0.3:
+            common_names.append(f"{genus[:5]} {species[:4]}")
+
+        features = rng.sample(FEATURES, 3)
+        catalog[key] = {
+            "name": f"{genus.title()} {species}",
+            "common_names": common_names,
+            "scientific_classification": f"Species of bacteria in the genus {genus.title()}",
+            "description": (
+                f"\n{genus.title()} {species} is a {features[0]} bacterium.\n\n"
+                f"Key characteristics:\n- {features[1].capitalize()}\n- {features[2].capitalize()}\n"
+            )
+        }
+    return catalog
+
+
+def _typo(rng, text):
+    position = rng.randrange(len(text))
+    operation = rng.random()
+    if operation < 0.33:
+        return text[:position] + text[position + 1:]
+    if operation < 0.66:
+        return text[:position] + rng.choice(string.ascii_lowercase) + text[position:]
+    return text[:position] + rng.choice(string.ascii_lowercase) + text[position + 1:]
+
+
+def generate_queries(catalog, count, seed=0):
+    """
+    Return a {category: [queries]} mix drawn from catalog: exact keys,
+    aliases, abbreviations, typos, junk and names only found online
+    """
+    rng = random.Random(seed)
+    keys = list(catalog)
+    per_category = max(1, count // 6)
+
+    def pick():
+        key = rng.choice(keys)
+        return key, catalog[key]
+
+    queries = {
+        "exact": [],
+        "alias": [],
+        "abbreviation": [],
+        "typo": [],
+        "junk": [],
+        "online_miss": [],
+    }
+    for _ in range(per_category):
+        key, info = pick()
+        queries["exact"].append(rng.choice([key, info["name"]]))
+        key, info = pick()
+        queries["alias"].append(rng.choice(info["common_names"]).title())
+        key, info = pick()
+        genus, species = key.split(" ", 1)
+        queries["abbreviation"].append(rng.choice([f"{genus[0].upper()}. {species}", f"{genus[0]}.{species}"]))
+        key, info = pick()
+        queries["typo"].append(_typo(rng, key))
+        queries["junk"].append(rng.choice([
+            "".join(rng.choices(string.ascii_letters + string.digits, k=rng.randint(3, 12))),
+            "".join(rng.choices("!@#$%^&*()", k=rng.randint(1, 5))),
+            f"hello{rng.randint(0, 999)}",
+        ]))
+        queries["online_miss"].append(f"Zz{_epithet(rng)} {_epithet(rng)}")
+    return queries
@@ -0,0 +1,128 @@
+import os
+
+# Settings can be overridden through environment variables so that each
+# deployment (Streamlit worker, batch job) can be tuned without code changes
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_flag(name, default=False):
+    value = os.environ.get(name)
+    return value.lower() in ("1", "true", "yes") if value else default
+
+
+# Local store of bacteria imported from taxonomy dumps (python -m database.ingest)
+TAXONOMY_STORE_PATH = os.environ.get(
+    "BACTOPEDIA_TAXONOMY_STORE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "database", "data", "taxonomy.sqlite3")
+)
+
+# Persistent cache for online (Wikipedia) lookups
+RESULT_CACHE_PATH = os.environ.get(
+    "BACTOPEDIA_CACHE_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "bactopedia", "online_results.sqlite3")
+)
+RESULT_CACHE_MAX_ENTRIES = _env_int("BACTOPEDIA_CACHE_MAX_ENTRIES", 10000)
+# How long a found article stays fresh
+RESULT_CACHE_HIT_TTL = _env_float("BACTOPEDIA_CACHE_HIT_TTL", 7 * 24 * 3600)
+# How long "nothing found" is remembered before asking again
+RESULT_CACHE_MISS_TTL = _env_float("BACTOPEDIA_CACHE_MISS_TTL", 6 * 3600)
+# How long an expired entry may still be served while it is refreshed
+RESULT_CACHE_STALE_TTL = _env_float("BACTOPEDIA_CACHE_STALE_TTL", 24 * 3600)
+
+# Concurrent identical online lookups share one fetch: "thread" coalesces
+# within a process, "process" also across processes sharing the cache file
+RESULT_CACHE_COALESCING = os.environ.get("BACTOPEDIA_CACHE_COALESCING", "process")
+
+# Wikipedia API endpoint used for online lookups; point it at a local
+# stand-in server when testing
+WIKIPEDIA_API_URL = os.environ.get("BACTOPEDIA_WIKIPEDIA_API_URL", "https://en.wikipedia.org/w/api.php")
+
+# Shared HTTP client used for online lookups
+HTTP_CONNECT_TIMEOUT = _env_float("BACTOPEDIA_HTTP_CONNECT_TIMEOUT", 3.05)
+HTTP_READ_TIMEOUT = _env_float("BACTOPEDIA_HTTP_READ_TIMEOUT", 10.0)
+HTTP_MAX_RETRIES = _env_int("BACTOPEDIA_HTTP_MAX_RETRIES", 2)
+HTTP_BACKOFF_FACTOR = _env_float("BACTOPEDIA_HTTP_BACKOFF_FACTOR", 0.5)
+HTTP_POOL_SIZE = _env_int("BACTOPEDIA_HTTP_POOL_SIZE", 10)
+HTTP_USER_AGENT = os.environ.get("BACTOPEDIA_HTTP_USER_AGENT", "BACTO_PEDIA/1.0 (bacteria information assistant)")
+# Consecutive failures before online lookups are skipped, and for how long
+CIRCUIT_FAILURE_THRESHOLD = _env_int("BACTOPEDIA_CIRCUIT_FAILURE_THRESHOLD", 5)
+CIRCUIT_RESET_TIMEOUT = _env_float("BACTOPEDIA_CIRCUIT_RESET_TIMEOUT", 30.0)
+# Number of search candidates whose extracts are fetched in one request
+WIKIPEDIA_SEARCH_LIMIT = _env_int("BACTOPEDIA_WIKIPEDIA_SEARCH_LIMIT", 5)
+
+# Where online lookups are answered: "wikipedia" queries the live API,
+# "offline" serves them from a snapshot pack (python -m online.snapshot)
+# and never touches the network
+ONLINE_MODE = os.environ.get("BACTOPEDIA_ONLINE_MODE", "wikipedia")
+SNAPSHOT_PATH = os.environ.get(
+    "BACTOPEDIA_SNAPSHOT_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "online", "data", "wikipedia.snapshot")
+)
+
+# Background warm-up of the result cache (online/warmup.py)
+WARMUP_ENABLED = _env_flag("BACTOPEDIA_WARMUP", True)
+# Names to keep cached, one per line
+WARMUP_NAMES_PATH = os.environ.get(
+    "BACTOPEDIA_WARMUP_NAMES_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "online", "data", "popular_bacteria.txt")
+)
+# Seconds between warm-up runs; the first runs at process start
+WARMUP_INTERVAL = _env_float("BACTOPEDIA_WARMUP_INTERVAL", 3600)
+# How many of the most requested online names are kept warm as well
+WARMUP_RECENT_MISSES = _env_int("BACTOPEDIA_WARMUP_RECENT_MISSES", 50)
+# Entries that would stop being fresh within this many seconds are refreshed
+WARMUP_REFRESH_AHEAD = _env_float("BACTOPEDIA_WARMUP_REFRESH_AHEAD", 2 * 3600)
+# Upper bound on refreshes per run, and how many run at once
+WARMUP_MAX_REFRESH = _env_int("BACTOPEDIA_WARMUP_MAX_REFRESH", 200)
+WARMUP_CONCURRENCY = _env_int("BACTOPEDIA_WARMUP_CONCURRENCY", 2)
+
+# Names ranked first by autocompletion (database/prefix_index.py), one per
+# line, most popular first
+COMPLETION_NAMES_PATH = os.environ.get("BACTOPEDIA_COMPLETION_NAMES_PATH", WARMUP_NAMES_PATH)
+
+# Batch resolver (batch_lookup.py)
+BATCH_CONCURRENCY = _env_int("BACTOPEDIA_BATCH_CONCURRENCY", 8)
+# Maximum online lookups started per second; 0 disables the limit
+BATCH_RATE_LIMIT = _env_float("BACTOPEDIA_BATCH_RATE_LIMIT", 10.0)
+
+# Canonical forms of recent queries kept in memory (database/canonical.py)
+CANONICAL_CACHE_ENTRIES = _env_int("BACTOPEDIA_CANONICAL_CACHE_ENTRIES", 10000)
+
+# A local "did you mean" suggestion scoring at least this much is treated as
+# a typo and answered without searching online
+TYPO_SUGGESTION_CUTOFF = _env_float("BACTOPEDIA_TYPO_SUGGESTION_CUTOFF", 0.85)
+
+# Full-text hits answer a query only when it has at least this many distinct
+# terms; hits for vaguer queries ("water") are only offered as suggestions
+FULLTEXT_MIN_TERMS = _env_int("BACTOPEDIA_FULLTEXT_MIN_TERMS", 2)
+
+# Streamlit result cache for whole lookups, shared by every session
+UI_CACHE_TTL = _env_float("BACTOPEDIA_UI_CACHE_TTL", 3600)
+UI_CACHE_MAX_ENTRIES = _env_int("BACTOPEDIA_UI_CACHE_MAX_ENTRIES", 1000)
+# Threads running the online step of lookups for the UI, off the script thread
+UI_ONLINE_WORKERS = _env_int("BACTOPEDIA_UI_ONLINE_WORKERS", 4)
+
+# Show the metrics debug panel at the bottom of the Streamlit page
+METRICS_DEBUG_PANEL = _env_flag("BACTOPEDIA_METRICS_PANEL")
+# In-process metrics (metrics.py); off by default to keep the hot path lean
+METRICS_ENABLED = _env_flag("BACTOPEDIA_METRICS") or METRICS_DEBUG_PANEL
+
+# Headless lookup service (python -m service)
+SERVICE_HOST = os.environ.get("BACTOPEDIA_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = _env_int("BACTOPEDIA_SERVICE_PORT", 8080)
+# Worker processes sharing the listening socket and the prebuilt indexes
+SERVICE_WORKERS = _env_int("BACTOPEDIA_SERVICE_WORKERS", 1)
+# Threads per worker running lookups, so that online lookups blocking on
+# the network never stall the event loop
+SERVICE_THREADS = _env_int("BACTOPEDIA_SERVICE_THREADS", 16)
+# Largest number of names accepted by one /batch request
+SERVICE_MAX_BATCH = _env_int("BACTOPEDIA_SERVICE_MAX_BATCH", 1000)
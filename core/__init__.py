@@ -0,0 +1,21 @@
+from .lookup import (
+    canonicalize_query,
+    get_bacteria_info,
+    get_similar_bacteria,
+    is_bacteria_related,
+    validate_input,
+    complete_bacteria,
+    search_bacteria_online,
+    build_not_found_message,
+    resolve_bacteria,
+    resolve_bacteria_locally,
+    complete_online_lookup,
+    LookupResult,
+    PendingLookup,
+    STAGE_VALIDATION,
+    STAGE_LOCAL,
+    STAGE_FUZZY,
+    STAGE_FULLTEXT,
+    STAGE_ONLINE,
+    STAGE_NOT_FOUND
+)
@@ -0,0 +1,226 @@
+from collections import namedtuple
+
+import config
+from metrics import METRICS
+from database import (
+    BACTERIA_CLASSIFIER,
+    BACTERIA_DATABASE,
+    BACTERIA_INDEXES,
+    canonicalize_query,
+    get_indexes
+)
+from database.query_classifier import NOT_BACTERIA_MESSAGE
+from database.taxonomy_store import get_taxonomy_store
+
+
+def get_bacteria_info(input_name, database=BACTERIA_DATABASE):
+    """
+    Search for bacteria in database using name or common names with flexible matching.
+    Names missing from the bundled database are also looked up, exactly, in
+    the store of bacteria imported from taxonomy dumps.
+    """
+    indexes = get_indexes(database)
+    query = indexes.canonicalizer.canonicalize(input_name)
+    info = indexes.lookup.lookup(query)
+    if info is None and database is BACTERIA_DATABASE:
+        store = get_taxonomy_store(config.TAXONOMY_STORE_PATH)
+        if store is not None:
+            info = store.lookup(query)
+    return info
+
+
+def get_similar_bacteria(input_name, database=BACTERIA_DATABASE):
+    """
+    Find similar bacteria names from the database using fuzzy matching
+    """
+    # Names are compared as typed, only lowercased; folding is for lookups
+    suggestions = get_indexes(database).fuzzy.suggest(input_name.lower(), n=3, cutoff=0.6)
+    return [name for name, score in suggestions]
+
+
+def is_bacteria_related(query, database=BACTERIA_DATABASE):
+    """
+    Check if the query appears to be bacteria-related
+    """
+    indexes = get_indexes(database)
+    return indexes.classifier.is_bacteria_related(indexes.canonicalizer.canonicalize(query), query)
+
+
+def validate_input(bacteria_name, database=BACTERIA_DATABASE):
+    """
+    Validate user input and return appropriate error messages
+    """
+    indexes = get_indexes(database)
+    return indexes.classifier.validate(indexes.canonicalizer.canonicalize(bacteria_name), bacteria_name)
+
+
+def complete_bacteria(prefix, n=5, database=BACTERIA_DATABASE, skip_exact=False):
+    """
+    Suggest up to n (completion, entry) pairs for a partially typed name,
+    most popular first. With skip_exact, names equal to the input are left
+    out in favour of longer names of the same bacteria.
+    """
+    return get_indexes(database).prefix.complete(prefix, n=n, skip_exact=skip_exact)
+
+
+def search_bacteria_online(bacteria_name):
+    """
+    Search for bacteria information online using Wikipedia API.
+
+    Returns None when nothing is found or while Wikipedia is being skipped
+    after repeated failures; any other error is raised to the caller.
+    """
+    # Only queries that miss locally go online, so the HTTP client and the
+    # result cache are not loaded at startup
+    from online import CircuitOpenError, lookup_bacteria_online
+
+    try:
+        # Found articles and misses are both cached, so repeat queries
+        # never leave the process (or the disk cache) again
+        return lookup_bacteria_online(bacteria_name)
+    except CircuitOpenError:
+        # Wikipedia has been failing; skip the online step until it recovers
+        return None
+
+
+# Stages of resolve_bacteria, cheapest first; only the last one uses the network
+STAGE_VALIDATION = "validation"
+STAGE_LOCAL = "local"
+STAGE_FUZZY = "fuzzy"
+STAGE_FULLTEXT = "fulltext"
+STAGE_ONLINE = "online"
+STAGE_NOT_FOUND = "not_found"
+
+# Outcome of resolve_bacteria: the stage that answered, the bacteria
+# information it found (if any), the error to show otherwise, any error
+# raised while searching online, and whether the outcome may be cached (it
+# may not when the online step failed or was skipped)
+LookupResult = namedtuple(
+    "LookupResult",
+    ["stage", "info", "error", "online_error", "cacheable"],
+    defaults=(None, None, None, True)
+)
+
+# A query that no local stage could answer, to be finished online with
+# complete_online_lookup: its canonical form, its local did-you-mean names
+# and the query as typed
+PendingLookup = namedtuple("PendingLookup", ["query", "similar_names", "text"])
+
+
+def build_not_found_message(similar_names):
+    """
+    Build the "couldn't find" message with optional did-you-mean suggestions
+    """
+    error_message = "Sorry, I couldn't find information about that bacteria."
+
+    if similar_names:
+        error_message += "\n\nDid you mean one of these?"
+        for name in similar_names:
+            error_message += f"\n- {name.title()}"
+
+    error_message += "\n\nSuggestions:"
+    error_message += "\n- Check the spelling"
+    error_message += "\n- Try using the scientific name (e.g., 'Escherichia coli' instead of 'E coli')"
+    error_message += "\n- Try one of the example bacteria listed below"
+    return error_message
+
+
+def resolve_bacteria(user_input):
+    """
+    Resolve a query through the lookup stages, cheapest first, stopping at
+    the first stage that can answer. Only queries that pass every local
+    stage reach the network. Every stage but the fuzzy one sees the
+    canonical form of the query, so all spellings of a name resolve (and
+    are cached) alike; did-you-mean names are matched against the query as
+    typed, lowercased, as get_similar_bacteria does.
+    """
+    with METRICS.timer("bactopedia_resolve_seconds"):
+        result = _run_local_stages(user_input)
+        if isinstance(result, PendingLookup):
+            result = _run_online_stage(result)
+    METRICS.increment("bactopedia_lookups_total", stage=result.stage)
+    return result
+
+
+def resolve_bacteria_locally(user_input):
+    """
+    Run only the local stages of resolve_bacteria. Returns their
+    LookupResult, or a PendingLookup when the query has to go online.
+    """
+    result = _run_local_stages(user_input)
+    if not isinstance(result, PendingLookup):
+        METRICS.increment("bactopedia_lookups_total", stage=result.stage)
+    return result
+
+
+def complete_online_lookup(pending):
+    """Finish a PendingLookup from resolve_bacteria_locally with the online stage"""
+    result = _run_online_stage(pending)
+    METRICS.increment("bactopedia_lookups_total", stage=result.stage)
+    return result
+
+
+def _run_local_stages(user_input):
+    query = canonicalize_query(user_input)
+    # Malformed input never needs a lookup
+    with METRICS.timer("bactopedia_stage_seconds", stage=STAGE_VALIDATION):
+        is_valid, error_message = BACTERIA_CLASSIFIER.check_syntax(query)
+    if not is_valid:
+        return LookupResult(STAGE_VALIDATION, error=error_message)
+
+    with METRICS.timer("bactopedia_stage_seconds", stage=STAGE_LOCAL):
+        info = get_bacteria_info(query)
+    if info:
+        return LookupResult(STAGE_LOCAL, info)
+
+    # A close match to a known name is almost certainly a typo, unless the
+    # two start differently: "K. pneumoniae" names another genus than
+    # "S. pneumoniae" rather than misspelling it, so it is still searched
+    # online
+    with METRICS.timer("bactopedia_stage_seconds", stage=STAGE_FUZZY):
+        suggestions = BACTERIA_INDEXES.fuzzy.suggest(user_input.lower(), n=3, cutoff=0.6)
+    similar_names = [name for name, score in suggestions]
+    if (suggestions and suggestions[0][1] >= config.TYPO_SUGGESTION_CUTOFF
+            and suggestions[0][0].lower()[:1] == user_input.lower().lstrip()[:1]):
+        return LookupResult(STAGE_FUZZY, error=build_not_found_message(similar_names))
+
+    # Symptom or feature queries ("rice-water stools") match descriptions
+    fulltext = BACTERIA_INDEXES.fulltext
+    with METRICS.timer("bactopedia_stage_seconds", stage=STAGE_FULLTEXT):
+        matches = fulltext.search(query, k=3)
+    if matches and fulltext.term_count(query) >= config.FULLTEXT_MIN_TERMS:
+        return LookupResult(STAGE_FULLTEXT, matches[0][0])
+
+    # A single generic word ("water") matches arbitrary descriptions, so its
+    # hits are only suggested
+    for entry, score in matches:
+        if entry['name'].lower() not in (name.lower() for name in similar_names):
+            similar_names.append(entry['name'])
+    return PendingLookup(query, similar_names, user_input)
+
+
+def _run_online_stage(pending):
+    from online import CircuitOpenError, lookup_bacteria_online
+
+    query, similar_names, text = pending
+    online_error = None
+    online_complete = False
+    try:
+        # Wikipedia is searched for what the user typed; the result cache
+        # and concurrent lookups are keyed on its canonical form
+        with METRICS.timer("bactopedia_stage_seconds", stage=STAGE_ONLINE):
+            online_info = lookup_bacteria_online(text.strip())
+        if online_info:
+            return LookupResult(STAGE_ONLINE, online_info)
+        online_complete = True
+    except CircuitOpenError:
+        # Wikipedia has been failing; skip the online step until it recovers
+        pass
+    except Exception as e:
+        online_error = f"Error searching online: {str(e)}"
+
+    if not BACTERIA_CLASSIFIER.is_bacteria_related(query, text):
+        error_message = NOT_BACTERIA_MESSAGE
+    else:
+        error_message = build_not_found_message(similar_names)
+    return LookupResult(STAGE_NOT_FOUND, None, error_message, online_error, online_complete)
@@ -1 +1,30 @@
 from .bacteria_db import BACTERIA_DATABASE
+from .bacteria_index import BacteriaIndex
+from .canonical import QueryCanonicalizer, fold_query
+from .catalog_indexes import CatalogIndexes, get_indexes
+from .fulltext_index import FullTextIndex
+from .fuzzy_index import FuzzyIndex
+from .prefix_index import PrefixIndex
+from .query_classifier import QueryClassifier
+
+# Built once at import so that every query is served from the indexes. The
+# fuzzy index is only needed for names that miss and the full-text index
+# reads every description, so both are built on first use instead
+BACTERIA_INDEXES = get_indexes(BACTERIA_DATABASE, pin=True)
+BACTERIA_INDEX = BACTERIA_INDEXES.lookup
+BACTERIA_CLASSIFIER = BACTERIA_INDEXES.classifier
+
+
+def canonicalize_query(query):
+    """Return the canonical form of query for the bundled database"""
+    return BACTERIA_INDEXES.canonicalizer.canonicalize(query)
+
+
+def __getattr__(name):
+    if name == "BACTERIA_FUZZY_INDEX":
+        return BACTERIA_INDEXES.fuzzy
+    if name == "ShardedIndex":
+        # Only batch benchmarks use it, so it is not loaded at startup
+        from .sharded_index import ShardedIndex
+        return ShardedIndex
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,284 +1,6 @@
-# Extended database of common bacteria with both scientific and common names
-BACTERIA_DATABASE = {
-    "vibrio cholerae": {
-        "name": "Vibrio cholerae",
-        "common_names": ["vibrio", "vibrio bacteria", "vibrio species", "v. cholerae", "v cholerae", "vcholerae"],
-        "scientific_classification": "Species of Gram-negative bacteria in the family Vibrionaceae",
-        "description": """
-Vibrio cholerae is a species of Gram-negative bacteria that causes cholera, a severe diarrheal disease that can be life-threatening if untreated.
+from .catalog_store import load_catalog
 
-Key characteristics:
-- Shape: Curved rod (comma-shaped)
-- Motility: Highly motile with single polar flagellum
-- Habitat: Aquatic environments, especially brackish and estuarine waters
-- Notable features: Produces cholera toxin (CT)
-
-Medical significance:
-- Causes cholera, characterized by severe watery diarrhea
-- Can lead to severe dehydration and death if untreated
-- Major public health concern in developing regions
-- Responsible for several global pandemics
-
-Clinical importance:
-- Rapid onset of symptoms (2-3 days after exposure)
-- Produces rice-water stools characteristic of cholera
-- Treatment focuses on rehydration therapy
-- Can spread rapidly in areas with poor sanitation
-
-Prevention:
-- Clean water access and proper sanitation
-- Food safety and proper cooking of seafood
-- Oral cholera vaccines in endemic areas
-- Proper hand hygiene and sanitation practices
-        """
-    },
-    "escherichia coli": {
-        "name": "Escherichia coli",
-        "common_names": ["e. coli", "escherichia", "ecoli"],
-        "scientific_classification": "Species of Gram-negative bacteria in the family Enterobacteriaceae",
-        "description": """
-Escherichia coli (E. coli) is a diverse group of bacteria commonly found in the intestines of humans and animals.
-
-Key characteristics:
-- Shape: Rod-shaped
-- Type: Gram-negative
-- Habitat: Gut microbiota of warm-blooded organisms
-- Metabolism: Facultative anaerobe
-
-Medical significance:
-- Most strains are harmless and part of normal gut flora
-- Some strains can cause food poisoning
-- Can cause urinary tract infections
-- Certain strains produce Shiga toxin
-
-Research importance:
-- Model organism in microbiology
-- Used in biotechnology
-- Important in genetic studies
-        """
-    },
-    "staphylococcus aureus": {
-        "name": "Staphylococcus aureus",
-        "common_names": ["staph", "staphylococcus", "s. aureus", "golden staph", "staph aureus"],
-        "scientific_classification": "Genus of Gram-positive bacteria in the family Staphylococcaceae",
-        "description": """
-Staphylococcus aureus is a highly adaptable human pathogen and the most clinically significant species of staphylococci.
-
-Key characteristics:
-- Shape: Spherical (cocci) arranged in grape-like clusters
-- Type: Gram-positive
-- Habitat: Human skin and mucous membranes
-- Notable features: Golden pigmentation (hence "aureus")
-
-Medical significance:
-- Leading cause of skin and soft tissue infections
-- Major cause of food poisoning through enterotoxins
-- Can cause severe invasive infections
-- Methicillin-resistant strains (MRSA) are a global concern
-
-Clinical importance:
-- Common cause of surgical site infections
-- Can lead to toxic shock syndrome
-- Produces multiple virulence factors
-- High adaptability to antibiotics
-
-Prevention:
-- Strict hand hygiene
-- Proper wound care
-- Regular cleaning of surfaces
-- Safe food handling practices
-        """
-    },
-    "streptococcus pneumoniae": {
-        "name": "Streptococcus pneumoniae",
-        "common_names": ["strep", "streptococcus", "s. pneumoniae", "pneumococcus", "strep pneumo"],
-        "scientific_classification": "Genus of Gram-positive bacteria in the family Streptococcaceae",
-        "description": """
-Streptococcus pneumoniae (pneumococcus) is a major human pathogen responsible for significant morbidity and mortality worldwide.
-
-Key characteristics:
-- Shape: Spherical (cocci) arranged in pairs or short chains
-- Type: Gram-positive
-- Habitat: Upper respiratory tract
-- Notable features: Encapsulated bacterium
-
-Medical significance:
-- Leading cause of bacterial pneumonia
-- Common cause of meningitis
-- Frequent cause of otitis media (ear infections)
-- Can cause bacteremia and sepsis
-
-Clinical importance:
-- Multiple serotypes exist
-- Increasing antibiotic resistance
-- Particularly dangerous for elderly and young children
-- Major cause of vaccine-preventable disease
-
-Prevention:
-- Pneumococcal vaccination
-- Good respiratory hygiene
-- Prompt treatment of infections
-- Smoking cessation (reduces risk)
-        """
-    },
-    "bacillus subtilis": {
-        "name": "Bacillus subtilis",
-        "common_names": ["bacillus", "hay bacillus", "grass bacillus", "b. subtilis", "bacillus subtilis"],
-        "scientific_classification": "Species of Gram-positive bacteria in the genus Bacillus",
-        "description": """
-Bacillus subtilis is a Gram-positive, rod-shaped bacterium commonly found in soil and the gastrointestinal tract of humans.
-
-Key characteristics:
-- Shape: Rod-shaped
-- Type: Gram-positive
-- Habitat: Soil, water, and human digestive system
-- Notable features: Forms protective endospores
-
-Scientific importance:
-- Model organism for bacterial studies
-- Used in production of industrial enzymes
-- Important in biotechnology research
-- Natural antibiotic production
-
-Applications:
-- Production of enzymes for detergents
-- Probiotic supplements
-- Plant growth promotion
-- Fermentation in traditional foods
-
-Safety:
-- Generally recognized as safe (GRAS)
-- Used in various food fermentations
-- Non-pathogenic to humans
-- Important in soil health
-        """
-    },
-    "pseudomonas aeruginosa": {
-        "name": "Pseudomonas aeruginosa",
-        "common_names": ["pseudomonas aeruginosa", "p. aeruginosa", "blue pus bacteria"],
-        "scientific_classification": "Species of Gram-negative bacteria in the genus Pseudomonas",
-        "description": """
-Pseudomonas aeruginosa is an opportunistic pathogen known for its versatility and antibiotic resistance.
-
-Key characteristics:
-- Shape: Rod-shaped
-- Type: Gram-negative
-- Habitat: Soil, water, and hospital environments
-- Notable features: Produces blue-green pigment pyocyanin
-
-Medical significance:
-- Major cause of hospital-acquired infections
-- Common in respiratory tract infections
-- Particularly dangerous for cystic fibrosis patients
-- High antibiotic resistance
-
-Clinical importance:
-- Forms biofilms on medical devices
-- Causes severe infections in immunocompromised patients
-- Difficult to treat due to multiple drug resistance
-- Common in burn wound infections
-
-Prevention:
-- Strict hospital hygiene
-- Proper wound care
-- Regular medical device cleaning
-- Hand hygiene protocols
-        """
-    },
-    "mycobacterium tuberculosis": {
-        "name": "Mycobacterium tuberculosis",
-        "common_names": ["tubercle bacillus", "tb bacteria", "m. tuberculosis", "mtb"],
-        "scientific_classification": "Species of Gram-positive bacteria in the family Mycobacteriaceae",
-        "description": """
-Mycobacterium tuberculosis is the causative agent of tuberculosis (TB), one of the world's deadliest infectious diseases.
-
-Key characteristics:
-- Shape: Rod-shaped
-- Type: Acid-fast bacteria
-- Habitat: Human respiratory system
-- Notable features: Waxy cell wall
-
-Disease characteristics:
-- Primarily affects the lungs
-- Can remain dormant for years
-- Spreads through airborne droplets
-- May affect other organs (extrapulmonary TB)
-
-Medical significance:
-- Leading cause of death by infectious disease
-- Drug-resistant strains are emerging
-- Long treatment duration required
-- Global public health concern
-
-Prevention and control:
-- BCG vaccination
-- Early detection
-- Complete treatment course
-- Contact tracing
-        """
-    },
-    "helicobacter pylori": {
-        "name": "Helicobacter pylori",
-        "common_names": ["h. pylori", "helicobacter", "stomach bacteria"],
-        "scientific_classification": "Species of Gram-negative bacteria in the family Helicobacteraceae",
-        "description": """
-Helicobacter pylori is a bacteria that colonizes the human stomach and can cause various gastric diseases.
-
-Key characteristics:
-- Shape: Spiral (helical)
-- Type: Gram-negative
-- Habitat: Human stomach lining
-- Notable features: Survives in acidic environment
-
-Medical significance:
-- Major cause of chronic gastritis
-- Associated with peptic ulcers
-- Risk factor for stomach cancer
-- Common worldwide infection
-
-Clinical aspects:
-- Often acquired in childhood
-- May remain asymptomatic
-- Can be difficult to eradicate
-- Requires combination therapy
-
-Treatment and prevention:
-- Triple or quadruple antibiotic therapy
-- Acid suppression medication
-- Good hygiene practices
-- Regular testing in high-risk populations
-        """
-    },
-    "lactobacillus acidophilus": {
-        "name": "Lactobacillus acidophilus",
-        "common_names": ["l. acidophilus", "acidophilus", "probiotic bacteria"],
-        "scientific_classification": "Species of Gram-positive bacteria in the genus Lactobacillus",
-        "description": """
-Lactobacillus acidophilus is a beneficial probiotic bacteria commonly found in the human gut and fermented foods.
-
-Key characteristics:
-- Shape: Rod-shaped
-- Type: Gram-positive
-- Habitat: Human intestinal tract and fermented dairy
-- Notable features: Produces lactic acid
-
-Health benefits:
-- Promotes gut health
-- Helps maintain vaginal flora
-- Supports immune system
-- Aids in digestion
-
-Applications:
-- Used in probiotic supplements
-- Fermentation of dairy products
-- Production of antimicrobial compounds
-- Natural food preservation
-
-Safety and usage:
-- Generally recognized as safe (GRAS)
-- Common in yogurt and supplements
-- Well-studied probiotic strain
-- Natural part of human microbiome
-        """
-    }
-}
+# Catalog of common bacteria with both scientific and common names, edited in
+# data/bacteria.json and served from a packed, memory-mapped catalog file.
+# Entries are read-only mappings; descriptions are loaded on access.
+BACTERIA_DATABASE = load_catalog()
@@ -0,0 +1,128 @@
+from array import array
+from bisect import bisect_left
+
+from .canonical import fold_query
+
+# Block size used by the range-minimum table; small enough that scanning a
+# partial block is cheap, large enough to keep the sparse table compact.
+_BLOCK_SIZE = 64
+
+# Sorts after every character that can appear in an alias, so that
+# ``prefix + _MAX_CHAR`` bounds the range of suffixes starting with ``prefix``.
+_MAX_CHAR = "\U0010ffff"
+
+
+class _RangeMin:
+    """
+    Answer "smallest value in values[lo:hi]" in constant time using a sparse
+    table built over per-block minima
+    """
+
+    def __init__(self, values):
+        self.values = array("i", values)
+        block_mins = array("i", (
+            min(self.values[start:start + _BLOCK_SIZE])
+            for start in range(0, len(self.values), _BLOCK_SIZE)
+        ))
+
+        # levels[k][i] holds the minimum of block_mins[i:i + 2**k]
+        self.levels = [block_mins]
+        width = 1
+        while width * 2 <= len(block_mins):
+            previous = self.levels[-1]
+            self.levels.append(array("i", (
+                min(previous[i], previous[i + width])
+                for i in range(len(previous) - width)
+            )))
+            width *= 2
+
+    def query(self, lo, hi):
+        """Return the minimum of values[lo:hi], or None for an empty range"""
+        if lo >= hi:
+            return None
+
+        first_block = lo // _BLOCK_SIZE
+        last_block = (hi - 1) // _BLOCK_SIZE
+        if last_block - first_block < 2:
+            return min(self.values[lo:hi])
+
+        best = min(
+            min(self.values[lo:(first_block + 1) * _BLOCK_SIZE]),
+            min(self.values[last_block * _BLOCK_SIZE:hi]),
+        )
+        # Whole blocks in between are answered by two overlapping table reads
+        start, stop = first_block + 1, last_block
+        level = (stop - start).bit_length() - 1
+        table = self.levels[level]
+        return min(best, table[start], table[stop - (1 << level)])
+
+
+class SubstringIndex:
+    """
+    Sorted table of every suffix of a set of strings, each tagged with the
+    smallest owner id it belongs to.
+
+    Every substring of an indexed string is a prefix of one of its suffixes,
+    so "which owners contain this text" becomes a binary search for the block
+    of suffixes starting with it, and "which is the first owner" becomes a
+    range-minimum query over that block.
+    """
+
+    def __init__(self, strings):
+        owners = {}
+        for owner_id, text in strings:
+            for start in range(len(text) + 1):
+                suffix = text[start:]
+                if owners.get(suffix, owner_id) >= owner_id:
+                    owners[suffix] = owner_id
+
+        self.suffixes = sorted(owners)
+        self.owners = _RangeMin(owners[suffix] for suffix in self.suffixes)
+
+    def first_owner(self, text):
+        """Return the smallest owner id of a string containing text, or None"""
+        lo = bisect_left(self.suffixes, text)
+        hi = bisect_left(self.suffixes, text + _MAX_CHAR, lo)
+        return self.owners.query(lo, hi)
+
+
+class BacteriaIndex:
+    """
+    Lookup index over a bacteria database, built once and reused for every
+    query.
+
+    Names are indexed in their fold_query form, the form QueryCanonicalizer
+    gives queries, so lookups take canonical queries. An entry matches when
+    the query is a substring of one of its common names, of its key or of
+    its display name, and the earliest matching entry in database order
+    wins, as in a front-to-back scan of the database.
+    """
+
+    def __init__(self, database):
+        self.entries = list(database.values())
+
+        names = []
+        for entry_id, (key, info) in enumerate(database.items()):
+            for name in list(info.get('common_names', [])) + [key, info['name']]:
+                names.append((entry_id, fold_query(name)))
+        self.names = SubstringIndex(names)
+
+        # Known aliases are by far the most common queries, so their answers
+        # are resolved up front and served straight from a hash map
+        self.exact_matches = {}
+        for _, name in names:
+            if name not in self.exact_matches:
+                self.exact_matches[name] = self.names.first_owner(name)
+
+    def lookup_id(self, query):
+        """Return the position of the first entry matching a canonical query, or None"""
+        if query in self.exact_matches:
+            return self.exact_matches[query]
+        return self.names.first_owner(query)
+
+    def lookup(self, query):
+        """Return the first database entry matching a canonical query, or None"""
+        entry_id = self.lookup_id(query)
+        if entry_id is None:
+            return None
+        return self.entries[entry_id]
@@ -0,0 +1,69 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+import config
+
+# A dot between two letters, as in "e.coli" or "m.tb"
+_INNER_DOT = re.compile(r"(?<=[^\W\d_])\.(?=[^\W\d_])")
+
+
+def fold_query(text):
+    """
+    Fold a query, or a name to index, to plain lowercase text: accents and
+    compatibility forms are removed, a dot between two letters is dropped
+    ("m.tb" -> "mtb"), other dots become spaces ("e. coli" -> "e coli") and
+    whitespace is collapsed
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(_INNER_DOT.sub("", stripped.casefold()).replace(".", " ").split())
+
+
+def genus_abbreviations(database):
+    """
+    Map the abbreviated forms of the binomial keys of database to the keys:
+    "e coli" and "ecoli" -> "escherichia coli". Forms shared by two species,
+    or that already name another entry, are left out.
+    """
+    owners = {}
+    for key, info in database.items():
+        for name in [key, info['name']] + list(info.get('common_names', [])):
+            owners.setdefault(fold_query(name), key)
+
+    expansions = {}
+    ambiguous = set()
+    for key in database:
+        words = fold_query(key).split(" ")
+        if len(words) < 2 or len(words[0]) < 2 or not words[0].isalpha():
+            continue
+        genus, epithet = words[0], " ".join(words[1:])
+        for form in (f"{genus[0]} {epithet}", f"{genus[0]}{epithet.replace(' ', '')}"):
+            if owners.get(form, key) != key or expansions.get(form, key) != key:
+                ambiguous.add(form)
+            else:
+                expansions[form] = fold_query(key)
+    for form in ambiguous:
+        expansions.pop(form, None)
+    return expansions
+
+
+class QueryCanonicalizer:
+    """
+    Reduce every spelling of a query to one canonical form, used as the key
+    for the lookup indexes and the result caches: "E.coli", "e coli",
+    "E. Coli " and "ecoli" all become "escherichia coli".
+
+    Queries are folded with fold_query, then genus abbreviations of species
+    in the database are expanded. Characters that make a query invalid
+    (digits, symbols) are kept, so validation sees them. Results are
+    memoized in a bounded LRU.
+    """
+
+    def __init__(self, database, max_entries=config.CANONICAL_CACHE_ENTRIES):
+        self.expansions = genus_abbreviations(database)
+        self.canonicalize = lru_cache(maxsize=max_entries)(self._canonicalize)
+
+    def _canonicalize(self, query):
+        folded = fold_query(query)
+        return self.expansions.get(folded, folded)
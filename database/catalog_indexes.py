@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+from functools import cached_property
+
+import config
+
+from .bacteria_index import BacteriaIndex
+from .canonical import QueryCanonicalizer
+from .fulltext_index import FullTextIndex
+from .fuzzy_index import FuzzyIndex
+from .popularity import load_names, popularity_from_names
+from .prefix_index import PrefixIndex
+from .query_classifier import QueryClassifier
+
+# Indexes are kept for this many databases besides the bundled one
+_MAX_CACHED_DATABASES = 4
+
+
+class CatalogIndexes:
+    """
+    Lookup structures for one bacteria database, each built on first use
+    and then reused for every query against that database
+    """
+
+    def __init__(self, database):
+        self.database = database
+
+    @cached_property
+    def canonicalizer(self):
+        return QueryCanonicalizer(self.database)
+
+    @cached_property
+    def lookup(self):
+        return BacteriaIndex(self.database)
+
+    @cached_property
+    def fuzzy(self):
+        return FuzzyIndex.from_database(self.database)
+
+    @cached_property
+    def classifier(self):
+        # The lookup index already holds every name folded; sharing it
+        # avoids a second suffix table over the same names
+        return QueryClassifier(self.database, names=self.lookup.names)
+
+    @cached_property
+    def prefix(self):
+        popular_names = load_names(config.COMPLETION_NAMES_PATH)
+        return PrefixIndex(self.database, popularity_from_names(self.database, popular_names))
+
+    @cached_property
+    def fulltext(self):
+        return FullTextIndex(self.database)
+
+    def build_all(self):
+        """Build every index now instead of on first use, and return self"""
+        for name in ("canonicalizer", "lookup", "fuzzy", "classifier", "prefix", "fulltext"):
+            getattr(self, name)
+        return self
+
+
+_pinned = {}
+_recent = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_indexes(database, pin=False):
+    """
+    Return the CatalogIndexes for database. Indexes are tied to the database
+    object, so a changed catalog should be passed as a new mapping. Pinned
+    databases are never evicted; a few others are kept in LRU order.
+    """
+    with _lock:
+        indexes = _pinned.get(id(database)) or _recent.get(id(database))
+        if indexes is not None and indexes.database is database:
+            if id(database) in _recent:
+                _recent.move_to_end(id(database))
+            return indexes
+
+        indexes = CatalogIndexes(database)
+        if pin:
+            _pinned[id(database)] = indexes
+        else:
+            _recent[id(database)] = indexes
+            while len(_recent) > _MAX_CACHED_DATABASES:
+                _recent.popitem(last=False)
+        return indexes
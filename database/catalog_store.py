@@ -0,0 +1,277 @@
+"""
+Packed on-disk storage for the bacteria catalog.
+
+Layout of a catalog file:
+    MAGIC (8 bytes) | header length (uint32, little-endian) | JSON header | description blob
+
+The header holds every entry's names, aliases and classification as one
+row per entry, which are needed eagerly to build the lookup indexes. They
+are loaded into slotted records with deduplicated strings, so an alias that is
+also a key or a classification shared by a whole genus is stored once.
+
+Descriptions are dedented, stripped and zlib-compressed against a
+dictionary sampled from the descriptions themselves, which is kept
+compressed at the start of the blob. Each record only holds an (offset, length) pair into the blob,
+read through mmap and decompressed when the description is accessed, so
+worker processes share those pages through the OS cache.
+
+Rebuild a catalog from its JSON source with:
+    python -m database.catalog_store [source.json] [output.catalog]
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import textwrap
+import zlib
+from collections.abc import Mapping
+
+MAGIC = b"BACTOCAT"
+# Bumped whenever the layout changes, so older catalog files get rebuilt
+FORMAT_VERSION = 2
+_HEADER_LENGTH = struct.Struct("<I")
+
+# Fields kept in record slots; any other field goes to a per-entry dict
+_SLOT_FIELDS = ("name", "common_names", "scientific_classification")
+
+# zlib uses at most 32 KiB of preset dictionary
+_ZDICT_SIZE = 32 * 1024
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_SOURCE_PATH = os.path.join(DATA_DIR, "bacteria.json")
+DEFAULT_CATALOG_PATH = os.path.join(DATA_DIR, "bacteria.catalog")
+
+
+def _source_digest(source_bytes):
+    return hashlib.sha256(source_bytes).hexdigest()
+
+
+def normalize_description(text):
+    """Remove the indentation and surrounding blank lines of a description"""
+    return textwrap.dedent(text).strip()
+
+
+def _build_zdict(descriptions):
+    # Sample descriptions evenly across the catalog; zlib favours matches
+    # near the end of the dictionary, which is where later samples land
+    total = sum(len(text) for text in descriptions)
+    step = max(1, total // _ZDICT_SIZE)
+    sample = bytearray()
+    for index in range(0, len(descriptions), step):
+        sample += descriptions[index]
+    return bytes(sample[-_ZDICT_SIZE:])
+
+
+def _compress(data, zdict):
+    compressor = zlib.compressobj(9, zdict=zdict) if zdict else zlib.compressobj(9)
+    return compressor.compress(data) + compressor.flush()
+
+
+def write_catalog(database, path, source_digest=None):
+    """Write a bacteria database mapping to a packed catalog file at path"""
+    descriptions = [
+        normalize_description(info["description"]).encode("utf-8")
+        for info in database.values()
+        if "description" in info
+    ]
+    zdict = _build_zdict(descriptions)
+
+    # The dictionary itself is stored compressed and inflated once at open
+    blob = bytearray(_compress(zdict, None))
+    zdict_length = len(blob)
+    rows = []
+    descriptions = iter(descriptions)
+    for key, info in database.items():
+        row = [key] + [info.get(field) for field in _SLOT_FIELDS]
+        extra = {
+            field: value
+            for field, value in info.items()
+            if field not in _SLOT_FIELDS and field != "description"
+        }
+        if "description" in info:
+            compressed = _compress(next(descriptions), zdict)
+            row.append([len(blob), len(compressed)])
+            blob += compressed
+        else:
+            row.append(None)
+        row.append(extra or None)
+        rows.append(row)
+
+    header = json.dumps(
+        {
+            "format": FORMAT_VERSION,
+            "source_digest": source_digest,
+            "zdict_length": zdict_length,
+            "entries": rows,
+        },
+        ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+    # Write to a temporary file and rename so readers never see a partial file
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            f.write(blob)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def compile_catalog(source_path=DEFAULT_SOURCE_PATH, catalog_path=DEFAULT_CATALOG_PATH):
+    """Build a packed catalog from its JSON source"""
+    with open(source_path, "rb") as f:
+        source_bytes = f.read()
+    database = json.loads(source_bytes.decode("utf-8"))
+    write_catalog(database, catalog_path, _source_digest(source_bytes))
+
+
+class CatalogEntry(Mapping):
+    """
+    Compact read-only record of one catalog entry that behaves like the
+    plain dict entries of BACTERIA_DATABASE. Common names are a tuple and
+    the description is decompressed on access. Strings go through
+    `intern`, the deduplicating function of the owning CatalogStore.
+    """
+
+    __slots__ = (
+        "_store", "entry_id", "name", "common_names", "scientific_classification",
+        "_description_span", "_extra"
+    )
+
+    def __init__(self, store, entry_id, row, intern):
+        _, name, common_names, classification, description_span, extra = row
+        self._store = store
+        self.entry_id = entry_id
+        # Absent fields leave their slot unset, which reads as a KeyError
+        if name is not None:
+            self.name = intern(name)
+        if common_names is not None:
+            self.common_names = tuple(intern(alias) for alias in common_names)
+        if classification is not None:
+            self.scientific_classification = intern(classification)
+        self._description_span = description_span
+        self._extra = extra
+
+    def __getitem__(self, field):
+        if field in _SLOT_FIELDS:
+            try:
+                return getattr(self, field)
+            except AttributeError:
+                raise KeyError(field) from None
+        if field == "description" and self._description_span is not None:
+            return self._store.read_description(*self._description_span)
+        if self._extra is not None and field in self._extra:
+            return self._extra[field]
+        raise KeyError(field)
+
+    def __iter__(self):
+        for field in _SLOT_FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self._description_span is not None:
+            yield "description"
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"CatalogEntry({getattr(self, 'name', None)!r})"
+
+    def __reduce__(self):
+        # Pickled (e.g. by Streamlit's cache) as a plain dict, since the
+        # memory map cannot travel with it
+        return dict, (dict(self),)
+
+
+class CatalogStore(Mapping):
+    """
+    Bacteria catalog backed by a packed catalog file, exposing the same
+    mapping interface as the BACTERIA_DATABASE dict. Records are numbered
+    in catalog order by their entry_id.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a bacteria catalog file")
+        (header_length,) = _HEADER_LENGTH.unpack_from(self._map, len(MAGIC))
+        header_start = len(MAGIC) + _HEADER_LENGTH.size
+        header = json.loads(self._map[header_start:header_start + header_length].decode("utf-8"))
+        if header.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{path} has an outdated catalog format")
+        self._blob_start = header_start + header_length
+        self._zdict = zlib.decompress(self._map[self._blob_start:self._blob_start + header["zdict_length"]])
+
+        # Equal strings share one object. A local table is used rather than
+        # sys.intern, whose table would keep every unique name alive twice
+        strings = {}
+
+        def intern(text):
+            return strings.setdefault(text, text)
+
+        self.source_digest = header.get("source_digest")
+        self.records = []
+        self._ids = {}
+        for entry_id, row in enumerate(header["entries"]):
+            self.records.append(CatalogEntry(self, entry_id, row, intern))
+            self._ids[intern(row[0])] = entry_id
+
+    def read_description(self, offset, length):
+        start = self._blob_start + offset
+        decompressor = zlib.decompressobj(zdict=self._zdict) if self._zdict else zlib.decompressobj()
+        return decompressor.decompress(self._map[start:start + length]).decode("utf-8")
+
+    def __getitem__(self, key):
+        return self.records[self._ids[key]]
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self.records)
+
+
+def load_catalog(source_path=DEFAULT_SOURCE_PATH, catalog_path=DEFAULT_CATALOG_PATH):
+    """
+    Open the packed catalog, rebuilding it first when it is missing or was
+    built from a different version of the JSON source
+    """
+    with open(source_path, "rb") as f:
+        digest = _source_digest(f.read())
+
+    # The package directory may be read-only, in which case a private copy
+    # is kept in the temporary directory instead
+    fallback_path = os.path.join(tempfile.gettempdir(), f"bactopedia-{digest[:16]}.catalog")
+    for path in (catalog_path, fallback_path):
+        try:
+            store = CatalogStore(path)
+            if store.source_digest == digest:
+                return store
+        except (OSError, ValueError, zlib.error):
+            pass
+
+        try:
+            compile_catalog(source_path, path)
+        except OSError:
+            continue
+        return CatalogStore(path)
+
+    raise OSError(f"Could not write a bacteria catalog for {source_path}")
+
+
+if __name__ == "__main__":
+    compile_catalog(*sys.argv[1:3])
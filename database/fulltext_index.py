@@ -0,0 +1,107 @@
+import math
+import re
+from collections import defaultdict
+
+# Fields indexed for each entry; positions restart far apart in every field
+# so that phrases never match across field boundaries
+INDEXED_FIELDS = ['name', 'scientific_classification', 'description']
+_FIELD_GAP = 1000
+
+STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'for', 'from',
+    'in', 'is', 'it', 'of', 'on', 'or', 'that', 'the', 'to', 'with'
+])
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens with their positions, skipping stopwords"""
+    return [
+        (position, token)
+        for position, token in enumerate(_TOKEN.findall(text.lower()))
+        if token not in STOPWORDS
+    ]
+
+
+class FullTextIndex:
+    """
+    BM25-ranked inverted index over the name, classification and description
+    of every database entry.
+
+    Postings keep token positions, and documents containing the query terms
+    as a contiguous phrase are ranked above those that merely contain them.
+    Only documents containing every query term are returned.
+    """
+
+    def __init__(self, database, k1=1.2, b=0.75, phrase_boost=0.5):
+        self.k1 = k1
+        self.b = b
+        self.phrase_boost = phrase_boost
+        self.entries = list(database.values())
+        # term -> {entry_id: [positions]}
+        self.postings = defaultdict(dict)
+        self.lengths = []
+
+        for entry_id, info in enumerate(self.entries):
+            length = 0
+            for field_number, field in enumerate(INDEXED_FIELDS):
+                base = field_number * _FIELD_GAP
+                tokens = tokenize(info.get(field) or "")
+                for position, token in tokens:
+                    self.postings[token].setdefault(entry_id, []).append(base + position)
+                length += len(tokens)
+            self.lengths.append(length)
+
+        self.average_length = sum(self.lengths) / len(self.lengths) if self.lengths else 0.0
+
+    def _idf(self, term):
+        document_count = len(self.postings[term])
+        return math.log(1 + (len(self.entries) - document_count + 0.5) / (document_count + 0.5))
+
+    def _has_phrase(self, query_tokens, entry_id):
+        # Tokens must appear at the same relative positions as in the query
+        first_position, first_term = query_tokens[0]
+        following = [
+            (position - first_position, set(self.postings[term][entry_id]))
+            for position, term in query_tokens[1:]
+        ]
+        return any(
+            all(start + offset in positions for offset, positions in following)
+            for start in self.postings[first_term][entry_id]
+        )
+
+    def term_count(self, query):
+        """Return the number of distinct searchable terms in query"""
+        return len({token for _, token in tokenize(query)})
+
+    def search(self, query, k=5):
+        """Return up to k (entry, score) pairs matching every query term, best first"""
+        query_tokens = tokenize(query)
+        terms = [token for _, token in query_tokens]
+        if not terms or any(term not in self.postings for term in terms):
+            return []
+
+        # Intersect starting from the rarest term
+        unique_terms = sorted(set(terms), key=lambda term: len(self.postings[term]))
+        candidates = set(self.postings[unique_terms[0]])
+        for term in unique_terms[1:]:
+            candidates.intersection_update(self.postings[term])
+            if not candidates:
+                return []
+
+        idf = {term: self._idf(term) for term in unique_terms}
+        scored = []
+        for entry_id in candidates:
+            length_norm = 1 - self.b + self.b * self.lengths[entry_id] / self.average_length
+            score = 0.0
+            for term in unique_terms:
+                frequency = len(self.postings[term][entry_id])
+                score += idf[term] * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+            if len(terms) > 1 and self._has_phrase(query_tokens, entry_id):
+                score *= 1 + self.phrase_boost
+            scored.append((score, -entry_id))
+
+        scored.sort(reverse=True)
+        return [(self.entries[-negative_id], score) for score, negative_id in scored[:k]]
+
@@ -0,0 +1,264 @@
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from heapq import heappush, heappushpop
+from math import ceil
+
+# Scores a match must reach, tried from the highest down before the cutoff
+# itself. Most misspellings have n good matches, which are found without
+# looking at the names that share few characters with the query
+_LEVELS = (0.9, 0.8, 0.7)
+
+
+def _grams(text):
+    # One gram per character occurrence: ("a", 1), ("a", 2), ... so that two
+    # strings share as many grams as the characters they have in common,
+    # counted with repeats
+    seen = Counter()
+    grams = []
+    for char in text:
+        seen[char] += 1
+        grams.append((char, seen[char]))
+    return grams
+
+
+def min_shared_characters(total_length, cutoff):
+    """
+    Return the fewest characters two strings of total_length characters
+    between them must have in common for their SequenceMatcher.quick_ratio
+    to reach cutoff.
+
+    ratio() never exceeds quick_ratio(), since the matching blocks it counts
+    are characters both strings have, so names sharing fewer characters
+    cannot score cutoff.
+    """
+    if total_length == 0:
+        return 0
+    # Computed as quick_ratio computes its score, so that floating point
+    # rounding cannot leave out a name at exactly the cutoff
+    shared = max(0, ceil(cutoff * total_length / 2))
+    while shared > 0 and 2.0 * (shared - 1) / total_length >= cutoff:
+        shared -= 1
+    while 2.0 * shared / total_length < cutoff:
+        shared += 1
+    return shared
+
+
+def suggest_levels(cutoff):
+    """Return the scores asked of suggestions in turn, ending with cutoff"""
+    return [level for level in _LEVELS if level > cutoff] + [cutoff]
+
+
+def _id_mask(start, stop):
+    """Bitset of the ids in range(start, stop)"""
+    return (1 << stop) - (1 << start)
+
+
+def _set_ids(bits):
+    """Return the ids set in a bitset, lowest first"""
+    # Lowest bit first, so that a position in the string is an id
+    digits = bin(bits)[:1:-1]
+    ids = []
+    position = digits.find("1")
+    while position != -1:
+        ids.append(position)
+        position = digits.find("1", position + 1)
+    return ids
+
+
+def _common_subsequence_length(masks, length, text):
+    """
+    Return the length of the longest common subsequence of text and a
+    string of `length` characters whose positions masks holds per character.
+
+    The matching blocks SequenceMatcher.ratio counts form a common
+    subsequence, so this bounds ratio() more tightly than quick_ratio()
+    does, at a fraction of its cost. Computed a row of the table at a time
+    as a bitset (Hyyrö's bit-parallel algorithm).
+    """
+    full = (1 << length) - 1
+    row = full
+    for char in text:
+        matches = row & masks.get(char, 0)
+        if matches:
+            row = ((row + matches) | (row - matches)) & full
+    return length - bin(row).count("1")
+
+
+def _at_least(counts, shared, mask):
+    """
+    Return the ids of mask whose count is at least `shared`, where counts
+    holds the binary digits of every id's count as bitsets, lowest first
+    """
+    if shared <= 0:
+        return mask
+    if shared >= 1 << len(counts):
+        return 0
+    # Compared digit by digit from the highest: an id is greater once it has
+    # a 1 where `shared` has a 0 and all higher digits were equal
+    greater = 0
+    equal = mask
+    for digit in reversed(range(len(counts))):
+        if shared >> digit & 1:
+            equal &= counts[digit]
+        else:
+            greater |= equal & counts[digit]
+            equal &= ~counts[digit]
+    return greater | equal
+
+
+class FuzzyIndex:
+    """
+    "Did you mean" index over bacteria names.
+
+    Names are scored in lowercase and suggested as written. Unlike the
+    lookup indexes they are not folded, so that suggestions stay those
+    get_close_matches gives for the lowercased query.
+
+    The index holds, for each character occurrence (the second "a" of a
+    name, say), the bitset of the names that have it. Adding up the query's
+    bitsets gives, for every name at once, how many characters it shares
+    with the query, which bounds the score it can reach (see
+    min_shared_characters). Names whose bound reaches the score asked are
+    then bounded more tightly by their longest common subsequence with the
+    query and scored, best bound first, with the ratio
+    difflib.get_close_matches uses, so scores and ordering are exactly the
+    ones it gives.
+
+    The score asked of candidates starts high, which leaves few of them,
+    and is lowered towards the cutoff only while fewer than n names reach
+    it. Once n names are found, the lowest of their scores is asked of the
+    rest.
+    """
+
+    def __init__(self, names, counts=None):
+        # Names may repeat (a key that is also a common name); each
+        # occurrence is kept so results match a scan over the full list.
+        # counts replaces the occurrences when names are a slice of a
+        # larger list
+        self.counts = Counter(names) if counts is None else counts
+        lowered = {name: name.lower() for name in names}
+        # Numbered from the shortest form up, so that the names of a length
+        # window are a range of ids
+        self.names = sorted(lowered, key=lambda name: len(lowered[name]))
+        self.forms = [lowered[name] for name in self.names]
+        self.lengths = array('i', map(len, self.forms))
+
+        # Built as bytes, one bit per name, then turned into integers whose
+        # bitwise operations run over all the names at once
+        rows = {}
+        row_size = len(self.names) // 8 + 1
+        for name_id, form in enumerate(self.forms):
+            for gram in _grams(form):
+                row = rows.get(gram)
+                if row is None:
+                    row = rows[gram] = bytearray(row_size)
+                row[name_id >> 3] |= 1 << (name_id & 7)
+        self.bits = {gram: int.from_bytes(row, "little") for gram, row in rows.items()}
+
+    @classmethod
+    def from_database(cls, database):
+        """Index every key and common name of a bacteria database"""
+        names = []
+        for key, info in database.items():
+            names.append(key)
+            if 'common_names' in info:
+                names.extend(info['common_names'])
+        return cls(names)
+
+    def _length_range(self, length, cutoff):
+        # ratio = 2 * matches / total can only reach cutoff when the two
+        # lengths are close enough (real_quick_ratio)
+        if cutoff <= 0:
+            return 0, self.lengths[-1] if self.lengths else 0
+        return int(length * cutoff / (2 - cutoff)), int(length * (2 - cutoff) / cutoff) + 1
+
+    def _reaching(self, counts, length, cutoff):
+        """Return the bitset of the names whose shared characters allow cutoff"""
+        low, high = self._length_range(length, cutoff)
+        reaching = 0
+        start = bisect_left(self.lengths, low)
+        while start < len(self.names) and self.lengths[start] <= high:
+            # Names of one length need the same number of shared characters
+            name_length = self.lengths[start]
+            stop = bisect_left(self.lengths, name_length + 1, start)
+            shared = min_shared_characters(length + name_length, cutoff)
+            if shared <= min(length, name_length):
+                reaching |= _at_least(counts, shared, _id_mask(start, stop))
+            start = stop
+        return reaching
+
+    def suggest(self, query, n=3, cutoff=0.6):
+        """Return up to n (name, score) pairs scoring at least cutoff, best first"""
+        check_suggest_arguments(n, cutoff)
+        # Only misspelled names get here, so difflib is not loaded at startup
+        from difflib import SequenceMatcher
+
+        matcher = SequenceMatcher()
+        matcher.set_seq2(query)
+        length = len(query)
+        # The best n (score, form, name) triples so far, lowest first; ties
+        # are broken on the form, as get_close_matches breaks them
+        best = []
+
+        # Shared characters per name, as bitsets of their binary digits,
+        # added up one query gram at a time
+        counts = []
+        for gram in _grams(query):
+            carry = self.bits.get(gram, 0)
+            for digit in range(len(counts)):
+                if not carry:
+                    break
+                counts[digit], carry = counts[digit] ^ carry, counts[digit] & carry
+            if carry:
+                counts.append(carry)
+
+        # Positions of each character in the query, for the bound below
+        query_masks = {}
+        for position, char in enumerate(query):
+            query_masks[char] = query_masks.get(char, 0) | 1 << position
+
+        scored = 0
+        for level in suggest_levels(cutoff):
+            # Names that could still enter the best n score at least this
+            threshold = max(level, best[0][0]) if len(best) == n else level
+            candidates = self._reaching(counts, length, threshold) & ~scored
+            scored |= candidates
+
+            bounds = []
+            for name_id in _set_ids(candidates):
+                form = self.forms[name_id]
+                shared = _common_subsequence_length(query_masks, length, form)
+                bounds.append((2.0 * shared / (length + len(form)), name_id))
+            bounds.sort(reverse=True)
+
+            for bound, name_id in bounds:
+                # A bound equal to the lowest of the best n may still tie it
+                # and enter on the form
+                if len(best) == n and bound < best[0][0]:
+                    break
+                matcher.set_seq1(self.forms[name_id])
+                ratio = matcher.ratio()
+                if ratio < cutoff:
+                    continue
+                name = self.names[name_id]
+                for _ in range(self.counts[name]):
+                    if len(best) < n:
+                        heappush(best, (ratio, self.forms[name_id], name))
+                    else:
+                        heappushpop(best, (ratio, self.forms[name_id], name))
+
+            # Every name not scored yet shares too few characters to reach
+            # the threshold, which the best n all reach
+            if len(best) == n and best[0][0] >= threshold:
+                break
+
+        return [(name, ratio) for ratio, form, name in sorted(best, reverse=True)]
+
+
+def check_suggest_arguments(n, cutoff):
+    """Raise ValueError for the arguments difflib.get_close_matches rejects"""
+    if not n > 0:
+        raise ValueError("n must be > 0: %r" % (n,))
+    if not 0.0 <= cutoff <= 1.0:
+        raise ValueError("cutoff must be in [0.0, 1.0]: %r" % (cutoff,))
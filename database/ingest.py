@@ -0,0 +1,309 @@
+"""
+Import bacteria from taxonomy dumps into the local taxonomy store.
+
+Usage:
+    python -m database.ingest --names names.dmp --nodes nodes.dmp
+                              [--lineage rankedlineage.dmp] [--store path]
+    python -m database.ingest --csv organisms.csv [--store path]
+
+Inputs may be gzip-compressed (.gz). NCBI Taxonomy dumps are joined on
+their taxon id, and the files must be sorted by it, as distributed by NCBI.
+The Bacteria division of nodes.dmp also holds Archaea; give the
+rankedlineage.dmp of the new_taxdump archive to keep only taxa whose
+domain is Bacteria. Without it, archaeal taxa are imported too.
+CSV files need a "name" column and may add "common_names"
+(semicolon-separated), "scientific_classification", "description", "rank"
+and a "domain", "superkingdom" or "kingdom" column used to keep only
+Bacteria.
+
+Records are streamed through a generator pipeline, so memory use does not
+depend on the input size. Re-running an ingest only rewrites the records
+whose content changed. Records missing from the new input are deleted,
+unless --no-prune is given.
+"""
+import argparse
+import csv
+import gzip
+import hashlib
+import itertools
+import json
+import sys
+
+import config
+
+from .taxonomy_store import (
+    PRIORITY_ABBREVIATION,
+    PRIORITY_NAME,
+    PRIORITY_SYNONYM,
+    lookup_forms,
+    normalize_name,
+    open_for_writing
+)
+
+# NCBI division of Bacteria in nodes.dmp (division.dmp: 0 BCT Bacteria),
+# which also covers Archaea
+BACTERIA_DIVISION = 0
+
+# Domain (superkingdom) name of Bacteria in rankedlineage.dmp
+BACTERIA_DOMAIN = "Bacteria"
+
+# names.dmp name classes that people actually search for
+ALIAS_NAME_CLASSES = frozenset([
+    "synonym", "equivalent name", "common name", "genbank common name", "acronym"
+])
+
+DEFAULT_RANKS = ("species",)
+
+_BATCH_SIZE = 10000
+
+
+def _open_text(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def _dmp_rows(path):
+    # Fields are separated by "\t|\t" and every line ends with "\t|"
+    with _open_text(path) as f:
+        for line in f:
+            yield line.rstrip("\n").rstrip("\t|").split("\t|\t")
+
+
+def read_nodes(path):
+    """Yield (taxon_id, rank, division_id) from nodes.dmp"""
+    for fields in _dmp_rows(path):
+        yield int(fields[0]), fields[2], int(fields[4])
+
+
+def read_names(path):
+    """Yield (taxon_id, name, name_class) from names.dmp"""
+    for fields in _dmp_rows(path):
+        yield int(fields[0]), fields[1], fields[3]
+
+
+def read_lineages(path):
+    """
+    Yield (taxon_id, lineage) from rankedlineage.dmp, where lineage holds
+    the names of the taxon's ancestors at the main ranks, domain included
+    """
+    for fields in _dmp_rows(path):
+        yield int(fields[0]), fields[2:]
+
+
+def _ascending(rows, what):
+    previous = None
+    for row in rows:
+        if previous is not None and row[0] < previous:
+            raise ValueError(f"{what} must be sorted by taxon id (saw {row[0]} after {previous})")
+        previous = row[0]
+        yield row
+
+
+def abbreviations(scientific_name):
+    """
+    Return the abbreviated forms of a binomial name, in the style of the
+    curated common_names: "Escherichia coli" -> ["e. coli", "ecoli"]
+    """
+    words = normalize_name(scientific_name).split(" ")
+    if len(words) < 2 or not words[0].isalpha():
+        return []
+    genus, epithet = words[0], " ".join(words[1:])
+    return [f"{genus[0]}. {epithet}", f"{genus[0]}{epithet.replace(' ', '')}"]
+
+
+def make_record(name, common_names=(), scientific_classification="", description="", taxon_id=None):
+    """Build a record in the shape of a curated database entry"""
+    key = normalize_name(name)
+    aliases = []
+    for alias in list(common_names) + abbreviations(name):
+        alias = normalize_name(alias)
+        if alias and alias != key and alias not in aliases:
+            aliases.append(alias)
+    return {
+        "key": key,
+        "taxon_id": taxon_id,
+        "info": {
+            "name": name,
+            "common_names": aliases,
+            "scientific_classification": scientific_classification,
+            "description": description,
+        },
+        # Generated abbreviations rank below names the source provided
+        "abbreviations": [alias for alias in abbreviations(name) if alias in aliases],
+    }
+
+
+def _in_bacteria_domain(nodes, lineages):
+    # Both streams are sorted by taxon id, so they are merge-joined
+    lineage = next(lineages, None)
+    for node in nodes:
+        while lineage is not None and lineage[0] < node[0]:
+            lineage = next(lineages, None)
+        if lineage is None:
+            return
+        if lineage[0] == node[0] and BACTERIA_DOMAIN in lineage[1]:
+            yield node
+
+
+def taxonomy_records(nodes_path, names_path, ranks=DEFAULT_RANKS, lineage_path=None):
+    """
+    Yield a record for every taxon of the given ranks in the Bacteria
+    division, joining the sorted nodes.dmp and names.dmp streams on their
+    taxon id. With lineage_path (rankedlineage.dmp), taxa outside the
+    Bacteria domain, such as Archaea, are left out.
+    """
+    ranks = set(ranks)
+    nodes = (
+        node for node in _ascending(read_nodes(nodes_path), "nodes.dmp")
+        if node[2] == BACTERIA_DIVISION and node[1] in ranks
+    )
+    if lineage_path is not None:
+        nodes = _in_bacteria_domain(nodes, _ascending(read_lineages(lineage_path), "rankedlineage.dmp"))
+    names = itertools.groupby(_ascending(read_names(names_path), "names.dmp"), key=lambda row: row[0])
+
+    taxon_names = next(names, None)
+    for taxon_id, rank, _ in nodes:
+        while taxon_names is not None and taxon_names[0] < taxon_id:
+            taxon_names = next(names, None)
+        if taxon_names is None:
+            return
+        if taxon_names[0] != taxon_id:
+            continue
+
+        scientific_name = None
+        synonyms = []
+        for _, name, name_class in taxon_names[1]:
+            if name_class == "scientific name":
+                scientific_name = name
+            elif name_class in ALIAS_NAME_CLASSES:
+                synonyms.append(name)
+        taxon_names = next(names, None)
+        if scientific_name is None:
+            continue
+
+        yield make_record(
+            scientific_name,
+            synonyms,
+            scientific_classification=f"{rank.capitalize()} of Bacteria (NCBI Taxonomy ID {taxon_id})",
+            description=f"{scientific_name} is a bacterial {rank} listed in the NCBI Taxonomy database.",
+            taxon_id=taxon_id
+        )
+
+
+def csv_records(path):
+    """Yield a record for every Bacteria row of a CSV file"""
+    with _open_text(path) as f:
+        for row in csv.DictReader(f):
+            domain = row.get("domain") or row.get("superkingdom") or row.get("kingdom")
+            if domain and domain.strip().lower() != "bacteria":
+                continue
+            name = (row.get("name") or "").strip()
+            if not name:
+                continue
+            rank = (row.get("rank") or "").strip()
+            yield make_record(
+                name,
+                [alias for alias in (row.get("common_names") or "").split(";") if alias.strip()],
+                scientific_classification=(row.get("scientific_classification") or "").strip()
+                or (f"{rank.capitalize()} of Bacteria" if rank else "Bacteria"),
+                description=(row.get("description") or "").strip(),
+                taxon_id=int(row["id"]) if (row.get("id") or "").strip().isdigit() else None
+            )
+
+
+def _digest(record):
+    # The alias rows are part of the digest, so that records are rewritten
+    # when the way names are normalized changes
+    encoded = json.dumps([record["taxon_id"], record["info"], sorted(_alias_rows(record))], sort_keys=True)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def _alias_rows(record):
+    key = record["key"]
+    rows = {}
+    names = [(key, PRIORITY_NAME), (record["info"]["name"], PRIORITY_NAME)]
+    names += [
+        (alias, PRIORITY_ABBREVIATION if alias in record["abbreviations"] else PRIORITY_SYNONYM)
+        for alias in record["info"]["common_names"]
+    ]
+    for name, priority in names:
+        for form in lookup_forms(name):
+            rows[form] = min(priority, rows.get(form, priority))
+    return [(form, key, priority) for form, priority in rows.items()]
+
+
+def ingest(records, store_path=config.TAXONOMY_STORE_PATH, prune=True):
+    """
+    Write records into the store at store_path, rewriting only new or
+    changed ones, and return counts of what happened to them
+    """
+    records = iter(records)
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0, "duplicate": 0, "deleted": 0}
+    conn = open_for_writing(store_path)
+    try:
+        conn.execute("CREATE TEMP TABLE seen (key TEXT PRIMARY KEY)")
+        for batch in iter(lambda: list(itertools.islice(records, _BATCH_SIZE)), []):
+            with conn:
+                for record in batch:
+                    key = record["key"]
+                    if conn.execute("INSERT OR IGNORE INTO seen VALUES (?)", (key,)).rowcount == 0:
+                        # The same name twice in one input; the first wins
+                        stats["duplicate"] += 1
+                        continue
+
+                    digest = _digest(record)
+                    row = conn.execute("SELECT digest FROM records WHERE key = ?", (key,)).fetchone()
+                    if row is not None and row[0] == digest:
+                        stats["unchanged"] += 1
+                        continue
+
+                    stats["updated" if row is not None else "inserted"] += 1
+                    conn.execute(
+                        "INSERT OR REPLACE INTO records (key, taxon_id, digest, info) VALUES (?, ?, ?, ?)",
+                        (key, record["taxon_id"], digest, json.dumps(record["info"], ensure_ascii=False))
+                    )
+                    conn.execute("DELETE FROM aliases WHERE key = ?", (key,))
+                    conn.executemany("INSERT INTO aliases VALUES (?, ?, ?)", _alias_rows(record))
+
+        if prune:
+            with conn:
+                stats["deleted"] = conn.execute(
+                    "DELETE FROM records WHERE key NOT IN (SELECT key FROM seen)"
+                ).rowcount
+                conn.execute("DELETE FROM aliases WHERE key NOT IN (SELECT key FROM seen)")
+    finally:
+        conn.close()
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import bacteria from taxonomy dumps.")
+    parser.add_argument("--names", help="NCBI Taxonomy names.dmp (optionally .gz)")
+    parser.add_argument("--nodes", help="NCBI Taxonomy nodes.dmp (optionally .gz)")
+    parser.add_argument("--lineage",
+                        help="NCBI new_taxdump rankedlineage.dmp (optionally .gz), to leave out Archaea")
+    parser.add_argument("--csv", help="CSV file with a name column (optionally .gz)")
+    parser.add_argument("--ranks", nargs="+", default=list(DEFAULT_RANKS),
+                        help="taxonomy ranks to import (default: species)")
+    parser.add_argument("--store", default=config.TAXONOMY_STORE_PATH, help="taxonomy store to update")
+    parser.add_argument("--no-prune", action="store_true",
+                        help="keep stored records that are missing from this input")
+    args = parser.parse_args(argv)
+
+    if args.csv:
+        records = csv_records(args.csv)
+    elif args.names and args.nodes:
+        if not args.lineage:
+            print("No --lineage given: archaeal taxa in the Bacteria division are imported too",
+                  file=sys.stderr)
+        records = taxonomy_records(args.nodes, args.names, args.ranks, args.lineage)
+    else:
+        parser.error("give --names and --nodes, or --csv")
+
+    stats = ingest(records, args.store, prune=not args.no_prune)
+    print(json.dumps(stats), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+from .canonical import fold_query
+
+
+def load_names(path):
+    """Read one name per line, skipping blank lines and # comments"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = [line.strip() for line in f]
+    except OSError:
+        return []
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def popularity_from_names(database, names):
+    """
+    Score the database entries named in names, which are listed most popular
+    first: {database key: score}, higher first. Names are matched by key,
+    display name or common name; unknown names are ignored.
+    """
+    owners = {}
+    for key, info in database.items():
+        for name in [key, info['name']] + list(info.get('common_names', [])):
+            owners.setdefault(fold_query(name), key)
+
+    scores = {}
+    for position, name in enumerate(names):
+        key = owners.get(fold_query(name))
+        if key is not None and key not in scores:
+            scores[key] = len(names) - position
+    return scores
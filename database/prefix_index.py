@@ -0,0 +1,97 @@
+import heapq
+from array import array
+from bisect import bisect_left
+
+from .bacteria_index import _MAX_CHAR, _RangeMin
+
+
+def normalize_prefix(text):
+    """Lowercase text and collapse runs of whitespace, keeping a trailing space"""
+    collapsed = " ".join(text.lower().split())
+    if collapsed and text[-1:].isspace():
+        collapsed += " "
+    return collapsed
+
+
+class PrefixIndex:
+    """
+    Autocomplete index over the keys, display names and common names of a
+    bacteria database.
+
+    Names are kept in one sorted array, so the names starting with a prefix
+    form a contiguous block found by binary search. Each name also carries
+    its rank in popularity order, and a range-minimum table over the ranks
+    yields the best names of any block one at a time, so a completion costs
+    the same however many names share the prefix.
+
+    Ranking follows `popularity` ({database key: score}, higher first) when
+    given, then shorter names, then database order. CatalogIndexes builds
+    the popularity from the names listed in config.COMPLETION_NAMES_PATH.
+    """
+
+    def __init__(self, database, popularity=None):
+        popularity = popularity or {}
+        self.entries = list(database.values())
+
+        # name -> (entry_id, displayed completion); the first entry wins
+        names = {}
+        for entry_id, (key, info) in enumerate(database.items()):
+            for name in [key, info['name']] + list(info.get('common_names', [])):
+                name_lower = " ".join(name.lower().split())
+                for variant in (name_lower, " ".join(name_lower.replace(".", " ").split())):
+                    if variant and variant not in names:
+                        names[variant] = (entry_id, name_lower)
+
+        self.names = sorted(names)
+        self.entry_ids = array("i", (names[name][0] for name in self.names))
+        self.completions = [names[name][1] for name in self.names]
+
+        keys = list(database)
+        order = sorted(
+            range(len(self.names)),
+            key=lambda position: (
+                -popularity.get(keys[self.entry_ids[position]], 0),
+                len(self.completions[position]),
+                self.entry_ids[position],
+                self.names[position],
+            )
+        )
+        ranks = array("i", [0]) * len(order)
+        for rank, position in enumerate(order):
+            ranks[position] = rank
+        self.position_of_rank = array("i", order)
+        self.ranks = _RangeMin(ranks)
+
+    def complete(self, prefix, n=5, skip_exact=False):
+        """
+        Return up to n (completion, entry) pairs for names starting with
+        prefix, best first, with at most one completion per entry. With
+        skip_exact, a name equal to the prefix is passed over, so its entry
+        is completed with its next best name instead.
+        """
+        prefix = normalize_prefix(prefix)
+        if not prefix or n <= 0:
+            return []
+
+        lo = bisect_left(self.names, prefix)
+        hi = bisect_left(self.names, prefix + _MAX_CHAR, lo)
+        if lo >= hi:
+            return []
+
+        # Pop the best-ranked name of a block, then split the block around it
+        heap = [(self.ranks.query(lo, hi), lo, hi)]
+        seen = set()
+        results = []
+        while heap and len(results) < n:
+            rank, lo, hi = heapq.heappop(heap)
+            position = self.position_of_rank[rank]
+            entry_id = self.entry_ids[position]
+            completion = self.completions[position]
+            if entry_id not in seen and not (skip_exact and self.names[position] == prefix):
+                seen.add(entry_id)
+                results.append((completion, self.entries[entry_id]))
+            if lo < position:
+                heapq.heappush(heap, (self.ranks.query(lo, position), lo, position))
+            if position + 1 < hi:
+                heapq.heappush(heap, (self.ranks.query(position + 1, hi), position + 1, hi))
+        return results
@@ -0,0 +1,91 @@
+import re
+
+from .bacteria_index import SubstringIndex
+from .canonical import fold_query
+
+# Common bacteria-related terms and suffixes
+BACTERIA_TERMS = [
+    'bacteria', 'bacterium', 'bacillus', 'coccus', 'vibrio',
+    'streptococcus', 'staphylococcus', 'mycobacterium', 'clostridium',
+    'lactobacillus', 'pseudomonas', 'escherichia', 'helicobacter'
+]
+
+# Common scientific name patterns, matched at the start of the query
+SCIENTIFIC_PATTERNS = [
+    r'\w+\s+\w+',  # Two-word scientific names
+    r'[A-Z]\.\s*\w+',  # Abbreviated genus (e.g., "E. coli")
+]
+
+EMPTY_INPUT_MESSAGE = "Please enter a bacteria name."
+DIGITS_MESSAGE = "Bacteria names typically don't contain numbers. Please check your input."
+INVALID_CHARS_MESSAGE = "Invalid characters detected. Bacteria names usually only contain letters, spaces, dots, and hyphens."
+NOT_BACTERIA_MESSAGE = "Please enter a valid bacteria name. Your query doesn't appear to be related to bacteria."
+
+_INVALID_CHARS = re.compile(r'[^a-zA-Z\s\.-]')
+
+
+class QueryClassifier:
+    """
+    Decide whether a query looks like a bacteria name.
+
+    The term list and the scientific name patterns are compiled into a
+    single regex, and the database names into a substring index, so a query
+    is classified in one pass over its text regardless of database size.
+    Names are indexed in their fold_query form, so queries are expected in
+    canonical form, optionally along with the text the user typed. The
+    substring index of a BacteriaIndex over the same database can be passed
+    as names, rather than building a second one.
+    """
+
+    def __init__(self, database, terms=BACTERIA_TERMS, patterns=SCIENTIFIC_PATTERNS, names=None):
+        anchored = "|".join(patterns)
+        any_term = "|".join(re.escape(term) for term in terms)
+        self.pattern = re.compile(rf'\A(?:{anchored})|{any_term}', re.IGNORECASE)
+
+        if names is None:
+            names = SubstringIndex(
+                (entry_id, fold_query(name))
+                for entry_id, (key, info) in enumerate(database.items())
+                for name in [key] + list(info.get('common_names', []))
+            )
+        self.names = names
+
+    def is_bacteria_related(self, query, text=None):
+        """
+        Check if the query appears to be bacteria-related. The patterns are
+        also tried on text, the query as typed, since canonical forms lose
+        the dot of an abbreviated genus ("S.enterica" -> "senterica")
+        """
+        if self.pattern.search(query) or (text is not None and self.pattern.search(text)):
+            return True
+
+        # Check if query is part of a name in our bacteria database
+        return self.names.first_owner(query) is not None
+
+    def check_syntax(self, bacteria_name):
+        """
+        Return (is_valid, error_message) considering only the characters of
+        the query, without checking whether it is bacteria-related
+        """
+        if not bacteria_name or bacteria_name.isspace():
+            return False, EMPTY_INPUT_MESSAGE
+
+        invalid = _INVALID_CHARS.findall(bacteria_name)
+        if invalid:
+            # Digits take precedence over other characters in the message
+            if any(char.isdigit() for char in invalid):
+                return False, DIGITS_MESSAGE
+            return False, INVALID_CHARS_MESSAGE
+
+        return True, None
+
+    def validate(self, bacteria_name, text=None):
+        """Return (is_valid, error_message) for a user query, given as for is_bacteria_related"""
+        is_valid, error_message = self.check_syntax(bacteria_name)
+        if not is_valid:
+            return is_valid, error_message
+
+        if not self.is_bacteria_related(bacteria_name, text):
+            return False, NOT_BACTERIA_MESSAGE
+
+        return True, None
@@ -0,0 +1,179 @@
+"""
+Parallel substring and fuzzy matching for very large catalogs.
+
+The catalog entries and the unique fuzzy names are each split into
+contiguous shards, which keep their positions in catalog order. Every shard
+answers a batch of queries on its own: the first entry of the shard that
+matches, and the best scoring fuzzy names of the shard. Merging picks the
+smallest entry position and the best scores overall, so results are the
+same as those of BacteriaIndex and FuzzyIndex over the whole catalog.
+
+Shards are built once in the parent process, which then forks its workers,
+so the workers share the index pages with it (as the lookup service does)
+instead of each building or unpickling its own copy.
+"""
+import gc
+import os
+from heapq import nlargest
+from .bacteria_index import BacteriaIndex
+from .fuzzy_index import FuzzyIndex, check_suggest_arguments, suggest_levels
+
+# Queries are sent to the workers in chunks of this size
+_CHUNK_SIZE = 64
+
+
+class _Shard:
+    def __init__(self, entries, entry_offset, names, counts):
+        self.entry_offset = entry_offset
+        self.lookup = BacteriaIndex(dict(entries))
+        # Occurrences are counted over the whole catalog, not the shard
+        self.fuzzy = FuzzyIndex(names, counts)
+
+    def first_matches(self, queries):
+        results = []
+        for query in queries:
+            entry_id = self.lookup.lookup_id(query)
+            results.append(entry_id + self.entry_offset if entry_id is not None else None)
+        return results
+
+    def suggestions(self, queries, n, cutoff):
+        return [self.fuzzy.suggest(query, n, cutoff) for query in queries]
+
+
+def _split(items, parts):
+    """Split items into at most `parts` contiguous slices, returning (offset, slice) pairs"""
+    size = -(-len(items) // parts) if items else 1
+    return [(start, items[start:start + size]) for start in range(0, len(items), size)]
+
+
+# Shards of the ShardedIndex that created the worker pool; set in the parent
+# right before forking, so the workers inherit them without pickling
+_worker_shards = None
+
+
+def _run_task(task):
+    method, shard_id, args = task
+    return getattr(_worker_shards[shard_id], method)(*args)
+
+
+class ShardedIndex:
+    """
+    Answer batches of substring lookups and fuzzy suggestions across a pool
+    of processes, with the same results as the single-process indexes.
+
+    `processes` defaults to the number of CPUs; with 0, or where processes
+    cannot be forked, shards are queried one after the other in this
+    process. Use as a context manager, or call close(), to stop the pool.
+    """
+
+    def __init__(self, database, processes=None, shards=None):
+        # Only imported when a sharded index is actually used
+        import multiprocessing
+
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if "fork" not in multiprocessing.get_all_start_methods():
+            processes = 0
+        shard_count = shards or max(processes, 1)
+
+        self.entries = list(database.values())
+
+        # Unique fuzzy names in first-seen order with their occurrence
+        # counts, as FuzzyIndex.from_database numbers them
+        self.counts = {}
+        for key, info in database.items():
+            for name in [key] + list(info.get('common_names', [])):
+                self.counts[name] = self.counts.get(name, 0) + 1
+        self.names = list(self.counts)
+
+        entry_slices = _split(list(database.items()), shard_count)
+        name_slices = _split(self.names, shard_count)
+        # One list may be shorter than the other for tiny catalogs
+        while len(entry_slices) < len(name_slices):
+            entry_slices.append((len(self.entries), []))
+        while len(name_slices) < len(entry_slices):
+            name_slices.append((len(self.names), []))
+        self.shards = [
+            _Shard(entries, entry_offset, names, self.counts)
+            for (entry_offset, entries), (_, names) in zip(entry_slices, name_slices)
+        ]
+
+        self._pool = None
+        if processes > 0:
+            global _worker_shards
+            _worker_shards = self.shards
+            # Keep the workers' collector from touching, and so copying, the
+            # shared pages. The parent only stays frozen if its caller had
+            # frozen it already (as the lookup service does)
+            already_frozen = gc.get_freeze_count() > 0
+            if not already_frozen:
+                gc.freeze()
+            try:
+                self._pool = multiprocessing.get_context("fork").Pool(processes)
+            finally:
+                if not already_frozen:
+                    gc.unfreeze()
+
+    def _map(self, method, queries, *args):
+        """Return, per shard, method's results for every query"""
+        chunks = [queries[start:start + _CHUNK_SIZE] for start in range(0, len(queries), _CHUNK_SIZE)]
+        tasks = [(method, shard_id, (chunk,) + args) for shard_id in range(len(self.shards)) for chunk in chunks]
+        if self._pool is not None:
+            outputs = self._pool.map(_run_task, tasks, chunksize=1)
+        else:
+            outputs = [getattr(self.shards[shard_id], method)(*args) for method, shard_id, args in tasks]
+
+        per_shard = []
+        for shard_id in range(len(self.shards)):
+            results = []
+            for output in outputs[shard_id * len(chunks):(shard_id + 1) * len(chunks)]:
+                results.extend(output)
+            per_shard.append(results)
+        return per_shard
+
+    def lookup_many(self, queries):
+        """Return the first matching entry (or None) for each query, like BacteriaIndex.lookup"""
+        queries = list(queries)
+        per_shard = self._map("first_matches", queries)
+        results = []
+        for index in range(len(queries)):
+            matches = [shard_matches[index] for shard_matches in per_shard if shard_matches[index] is not None]
+            results.append(self.entries[min(matches)] if matches else None)
+        return results
+
+    def suggest_many(self, queries, n=3, cutoff=0.6):
+        """Return up to n (name, score) pairs for each query, like FuzzyIndex.suggest"""
+        check_suggest_arguments(n, cutoff)
+        queries = list(queries)
+        results = [None] * len(queries)
+        pending = list(range(len(queries)))
+        # As FuzzyIndex.suggest does, shards are first asked for names
+        # scoring a high level, which they find cheaply, and the level is
+        # lowered only for the queries that have fewer than n such names
+        for level in suggest_levels(cutoff):
+            if not pending:
+                break
+            per_shard = self._map("suggestions", [queries[index] for index in pending], n, level)
+            unanswered = []
+            for position, index in enumerate(pending):
+                # The best n overall are among the best n of each shard
+                # Ties are broken on the lowercased name, as FuzzyIndex does
+                scored = [(score, name.lower(), name) for shard in per_shard for name, score in shard[position]]
+                if len(scored) >= n or level == cutoff:
+                    results[index] = [(name, score) for score, form, name in nlargest(n, scored)]
+                else:
+                    unanswered.append(index)
+            pending = unanswered
+        return results
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
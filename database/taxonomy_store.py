@@ -0,0 +1,109 @@
+"""
+Indexed SQLite store of bacteria imported from taxonomy dumps.
+
+Records have the same fields as the curated catalog entries. Every record
+is reachable through its key, its scientific name and its aliases, each
+as written (lowercase, single spaces) and in the fold_query form that
+canonical queries take. The store is written by `python -m database.ingest` and
+only read at lookup time.
+"""
+import json
+import os
+import threading
+from urllib.parse import quote
+
+from .canonical import fold_query
+
+# Lower priorities win when several records share an alias
+PRIORITY_NAME = 0
+PRIORITY_SYNONYM = 1
+PRIORITY_ABBREVIATION = 2
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS records (
+        key TEXT PRIMARY KEY,
+        taxon_id INTEGER,
+        digest TEXT NOT NULL,
+        info TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS aliases (
+        alias TEXT NOT NULL,
+        key TEXT NOT NULL,
+        priority INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS aliases_alias ON aliases (alias, priority);
+    CREATE INDEX IF NOT EXISTS aliases_key ON aliases (key);
+"""
+
+
+def normalize_name(name):
+    """Lowercase name and collapse whitespace"""
+    return " ".join(name.lower().split())
+
+
+def lookup_forms(name):
+    """Return the normalized forms of name under which it can be looked up"""
+    normalized = normalize_name(name)
+    folded = fold_query(name)
+    return [normalized] if folded == normalized else [normalized, folded]
+
+
+class TaxonomyStore:
+    """Read access to an ingested taxonomy store, safe to share between threads"""
+
+    def __init__(self, path):
+        # Only opened once something has been ingested, so sqlite3 is not
+        # loaded at startup
+        import sqlite3
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            f"file:{quote(os.path.abspath(path))}?mode=ro", uri=True, check_same_thread=False
+        )
+
+    def lookup(self, input_name):
+        """Return the info of the record best matching input_name exactly, or None"""
+        forms = lookup_forms(input_name)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT records.info FROM aliases JOIN records ON records.key = aliases.key "
+                f"WHERE aliases.alias IN ({','.join('?' * len(forms))}) "
+                "ORDER BY aliases.priority, records.taxon_id LIMIT 1",
+                forms
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+
+def open_for_writing(path):
+    """Open (creating if needed) a store for ingestion and return the connection"""
+    import sqlite3
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+_store = None
+_store_path = None
+_store_lock = threading.Lock()
+
+
+def get_taxonomy_store(path):
+    """Return the store at path, opened on first use, or None if nothing was ingested there"""
+    global _store, _store_path
+    with _store_lock:
+        # A missing store is looked for again on the next call, so that a
+        # store ingested while the app is running is picked up
+        if _store_path != path or _store is None:
+            _store = TaxonomyStore(path) if os.path.exists(path) else None
+            _store_path = path
+        return _store
@@ -2,9 +2,13 @@ from .ui_components import (
     setup_page,
     display_header,
     display_search_input,
+    display_suggestions,
     display_bacteria_info,
     display_online_info,
+    display_pending_lookup,
     display_error,
     display_examples,
-    display_footer
+    display_footer,
+    display_metrics_panel
 )
+from .caching import cache_lookup, recall_last, shared_resource, store_last
@@ -0,0 +1,53 @@
+import streamlit as st
+
+import config
+from metrics import METRICS
+
+
+def cache_lookup(func):
+    """
+    Cache a lookup function across reruns and sessions, bounded in size and
+    age
+    """
+    cached = st.cache_data(
+        ttl=config.UI_CACHE_TTL,
+        max_entries=config.UI_CACHE_MAX_ENTRIES,
+        show_spinner=False
+    )(func)
+
+    def wrapper(*args, **kwargs):
+        METRICS.increment("bactopedia_cache_requests_total", cache="ui")
+        return cached(*args, **kwargs)
+
+    wrapper.clear = cached.clear
+    return wrapper
+
+
+def shared_resource(func):
+    """Create a resource once per process and share it with every session"""
+    return st.cache_resource(show_spinner=False)(func)
+
+
+def recall_last(name, argument):
+    """
+    Return the result this session stored under name for argument with
+    store_last, or None when the argument has changed since
+    """
+    METRICS.increment("bactopedia_cache_requests_total", cache="session")
+    last = st.session_state.get(name)
+    if last is not None and last[0] == argument:
+        return last[1]
+
+    METRICS.increment("bactopedia_cache_misses_total", cache="session")
+    return None
+
+
+def store_last(name, argument, result, keep=True):
+    """
+    Remember result for argument so that reruns with the same argument can
+    reuse it; with keep false, forget any remembered result instead
+    """
+    if keep:
+        st.session_state[name] = (argument, result)
+    else:
+        st.session_state.pop(name, None)
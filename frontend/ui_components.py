@@ -1,5 +1,8 @@
 import streamlit as st
 
+from metrics import METRICS
+
+@METRICS.timed("bactopedia_render_seconds", component="setup_page")
 def setup_page():
     """Set up the Streamlit page configuration"""
     st.set_page_config(
@@ -8,6 +11,7 @@ def setup_page():
         layout="wide"
     )
 
+@METRICS.timed("bactopedia_render_seconds", component="display_header")
 def display_header():
     """Display the application header and description"""
     st.title("🦠 BACTO_PEDIA - Bacteria Information Assistant")
@@ -15,6 +19,7 @@ def display_header():
     This bot provides detailed scientific information about bacteria. Simply enter the name of the bacteria you want to learn about!
     """)
 
+@METRICS.timed("bactopedia_render_seconds", component="display_search_input")
 def display_search_input():
     """Display the search input field"""
     return st.text_input(
@@ -23,6 +28,25 @@ def display_search_input():
         placeholder="Enter any bacteria name (e.g., Vibrio, E coli)..."
     )
 
+def _choose_suggestion(name):
+    # Runs before the rerun, so the input shows the chosen name when redrawn
+    st.session_state["bacteria_input"] = name
+
+@METRICS.timed("bactopedia_render_seconds", component="display_suggestions")
+def display_suggestions(completions):
+    """Display completions of the typed name as buttons that fill in the input"""
+    st.caption("Matching bacteria:")
+    columns = st.columns(len(completions))
+    for column, (completion, entry) in zip(columns, completions):
+        column.button(
+            entry['name'],
+            key=f"suggestion_{entry['name']}",
+            help=f"Matches \"{completion}\"",
+            on_click=_choose_suggestion,
+            args=(entry['name'],)
+        )
+
+@METRICS.timed("bactopedia_render_seconds", component="display_bacteria_info")
 def display_bacteria_info(info):
     """Display information about a bacteria"""
     st.success(f"Here's what I know about {info['name']}:")
@@ -33,6 +57,7 @@ def display_bacteria_info(info):
     st.markdown("### Detailed Information")
     st.write(info['description'])
 
+@METRICS.timed("bactopedia_render_seconds", component="display_online_info")
 def display_online_info(online_info):
     """Display information found online"""
     st.success(f"Here's what I found about {online_info['name']}:")
@@ -44,41 +69,66 @@ def display_online_info(online_info):
     st.markdown("---")
     st.markdown(f"*Source: [{online_info['source']}]({online_info['url']})*")
 
+@METRICS.timed("bactopedia_render_seconds", component="display_pending_lookup")
+def display_pending_lookup(similar_names):
+    """
+    Show that an online search is running, along with any similar local
+    names, and return the placeholder that the online result replaces
+    """
+    placeholder = st.empty()
+    with placeholder.container():
+        st.info("Not in the local database, searching Wikipedia...")
+        if similar_names:
+            st.markdown("**Similar bacteria in the local database:**\n" + "\n".join(
+                f"- {name.title()}" for name in similar_names
+            ))
+    return placeholder
+
+@METRICS.timed("bactopedia_render_seconds", component="display_error")
 def display_error(error_message):
     """Display error message"""
     st.error(error_message)
 
-def display_examples():
-    """Display example bacteria names"""
-    st.markdown("---")
-    st.markdown("**Try these example bacteria names:**")
-    col1, col2, col3 = st.columns(3)
-
-    with col1:
-        st.markdown("""
+# Static sections are built once at import; reruns only re-emit them
+EXAMPLE_COLUMNS = [
+    """
         - Escherichia coli
         - Staphylococcus aureus
         - Streptococcus pneumoniae
-        """)
-
-    with col2:
-        st.markdown("""
+        """,
+    """
         - Bacillus subtilis
         - Lactobacillus acidophilus
         - Vibrio cholerae
-        """)
-
-    with col3:
-        st.markdown("""
+        """,
+    """
         - Pseudomonas aeruginosa
         - Mycobacterium tuberculosis
         - Helicobacter pylori
-        """)
+        """,
+]
+
+FOOTER_MARKDOWN = """
+    💡 **Note:** This bot combines a curated database with web searches to provide accurate information about bacteria.
+    For best results, try using the scientific name of the bacteria.
+    """
+
+@METRICS.timed("bactopedia_render_seconds", component="display_examples")
+def display_examples():
+    """Display example bacteria names"""
+    st.markdown("---")
+    st.markdown("**Try these example bacteria names:**")
+    for column, examples in zip(st.columns(len(EXAMPLE_COLUMNS)), EXAMPLE_COLUMNS):
+        column.markdown(examples)
 
+@METRICS.timed("bactopedia_render_seconds", component="display_footer")
 def display_footer():
     """Display footer information"""
     st.markdown("---")
-    st.markdown("""
-    💡 **Note:** This bot combines a curated database with web searches to provide accurate information about bacteria.
-    For best results, try using the scientific name of the bacteria.
-    """)
+    st.markdown(FOOTER_MARKDOWN)
+
+@METRICS.timed("bactopedia_render_seconds", component="display_metrics_panel")
+def display_metrics_panel(metrics_text):
+    """Display collected performance metrics for debugging"""
+    with st.expander("Performance metrics"):
+        st.code(metrics_text, language="text")
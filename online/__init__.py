@@ -0,0 +1,5 @@
+from .singleflight import FileLockSingleFlight, SingleFlight
+from .result_cache import ResultCache, cache_key, get_result_cache
+from .http_client import CircuitBreaker, CircuitOpenError, HttpClient, get_http_client
+from .wikipedia import fetch_bacteria_summary, is_bacteria_article, lookup_bacteria_online
+from .warmup import WarmupJob, load_names, start_warmup
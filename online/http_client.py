@@ -0,0 +1,175 @@
+import threading
+import time
+
+import config
+from metrics import METRICS
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a request while the upstream is unhealthy"""
+
+
+class CircuitBreaker:
+    """
+    Track consecutive upstream failures and short-circuit requests for a
+    while once too many have happened in a row.
+
+    After reset_timeout a single trial request is let through; its outcome
+    either closes the circuit again or restarts the wait.
+    """
+
+    def __init__(self, failure_threshold=config.CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout=config.CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_request(self):
+        """Raise CircuitOpenError if the request should be skipped"""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if self._trial_in_flight or time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError("Online search is temporarily unavailable.")
+            self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class HttpClient:
+    """
+    Keep-alive HTTP client with connection pooling, connect/read timeouts,
+    bounded retries with exponential backoff and a circuit breaker.
+
+    Only failures that are cheap to detect are retried: connection errors,
+    429 and 5xx responses. A read timeout is never retried, so one request
+    waits at most read_timeout for an upstream that stopped answering. Every
+    failed attempt counts toward the circuit breaker.
+    """
+
+    def __init__(self, connect_timeout=config.HTTP_CONNECT_TIMEOUT,
+                 read_timeout=config.HTTP_READ_TIMEOUT,
+                 max_retries=config.HTTP_MAX_RETRIES,
+                 backoff_factor=config.HTTP_BACKOFF_FACTOR,
+                 pool_size=config.HTTP_POOL_SIZE,
+                 circuit_breaker=None):
+        # requests takes longer to import than the rest of the lookup code
+        # together, so it is only loaded once an online lookup needs it
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self._request_error = requests.RequestException
+        # Raised before the upstream could have started on the request; a
+        # ReadTimeout is not one of them
+        self._connect_error = requests.ConnectionError
+
+        # Retries are made by get_json, so that each attempt is seen by the
+        # circuit breaker
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = config.HTTP_USER_AGENT
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _retry_delay(self, attempt, response=None):
+        """Return seconds to wait before retrying, or None to give up"""
+        if attempt > self.max_retries:
+            return None
+        delay = self.backoff_factor * (2 ** (attempt - 1))
+        retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+        if retry_after.isdigit():
+            # Waiting longer than a request may take defeats the timeouts
+            if int(retry_after) > self.timeout[1]:
+                return None
+            delay = max(delay, int(retry_after))
+        return delay
+
+    def get_json(self, url, params=None):
+        """
+        GET url and decode the JSON body.
+
+        Raises CircuitOpenError without touching the network while the
+        circuit is open, and requests exceptions for failed requests.
+        """
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                self.circuit_breaker.before_request()
+            except CircuitOpenError:
+                METRICS.increment("bactopedia_http_requests_total", outcome="circuit_open")
+                raise
+
+            attempt += 1
+            METRICS.increment("bactopedia_http_attempts_total")
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except self._request_error as e:
+                self.circuit_breaker.record_failure()
+                delay = self._retry_delay(attempt) if isinstance(e, self._connect_error) else None
+                if delay is None:
+                    METRICS.observe("bactopedia_http_request_seconds", time.perf_counter() - started)
+                    METRICS.increment("bactopedia_http_requests_total", outcome="error")
+                    raise
+                time.sleep(delay)
+                continue
+
+            # Client errors mean the request was wrong, not that the upstream is down
+            if response.status_code >= 500 or response.status_code == 429:
+                self.circuit_breaker.record_failure()
+                delay = self._retry_delay(attempt, response)
+                if delay is not None:
+                    response.close()
+                    time.sleep(delay)
+                    continue
+            else:
+                self.circuit_breaker.record_success()
+            break
+
+        if METRICS.enabled:
+            METRICS.observe("bactopedia_http_request_seconds", time.perf_counter() - started)
+            METRICS.increment("bactopedia_http_response_bytes_total", len(response.content))
+            METRICS.increment("bactopedia_http_requests_total", outcome=str(response.status_code))
+
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        self.session.close()
+
+
+_http_client = None
+_http_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Return the process-wide HTTP client, creating it on first use"""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = HttpClient()
+        return _http_client
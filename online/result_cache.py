@@ -0,0 +1,312 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from database import canonicalize_query
+from metrics import METRICS
+
+from .singleflight import FileLockSingleFlight, SingleFlight
+
+FRESH = "fresh"
+STALE = "stale"
+EXPIRED = "expired"
+
+
+def cache_key(query):
+    """Canonicalize a query so that every spelling of a name shares an entry"""
+    return canonicalize_query(query)
+
+
+class ResultCache:
+    """
+    Persistent cache of online lookup results backed by SQLite.
+
+    Both found articles and "nothing found" answers are stored, each with
+    its own time to live. Expired entries are still served for a grace
+    period while a background refresh runs (stale-while-revalidate), and the
+    least recently used entries are evicted once the cache is full. A small
+    in-memory layer in front of SQLite serves repeat queries without
+    touching the disk; the access times of its hits are written back in
+    batches, at most every `access_flush_interval` seconds and before
+    anything is evicted, so that eviction still sees them.
+    """
+
+    def __init__(self, path=config.RESULT_CACHE_PATH,
+                 max_entries=config.RESULT_CACHE_MAX_ENTRIES,
+                 hit_ttl=config.RESULT_CACHE_HIT_TTL,
+                 miss_ttl=config.RESULT_CACHE_MISS_TTL,
+                 stale_ttl=config.RESULT_CACHE_STALE_TTL,
+                 coalescing=config.RESULT_CACHE_COALESCING,
+                 memory_entries=256, popularity_entries=10000, access_flush_interval=10):
+        self.max_entries = max_entries
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self.stale_ttl = stale_ttl
+        self.memory_entries = memory_entries
+        self.popularity_entries = popularity_entries
+        self.access_flush_interval = access_flush_interval
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        # Last access time of the keys served from memory since the last flush
+        self._accessed = {}
+        self._flushed_at = time.monotonic()
+        self._refreshing = set()
+        # Requests per key since the popularity was last decayed
+        self._popularity = Counter()
+        self._executor = None
+
+        if path != ":memory:":
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            except OSError:
+                # Fall back to a process-local cache rather than failing lookups
+                path = ":memory:"
+
+        self._flights = SingleFlight()
+        if coalescing == "process" and path != ":memory:":
+            try:
+                self._flights = FileLockSingleFlight(
+                    os.path.join(os.path.dirname(os.path.abspath(path)), "locks")
+                )
+            except OSError:
+                # No file locks here; still coalesce within the process
+                pass
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                value TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS results_accessed_at ON results (accessed_at)"
+        )
+        self._conn.commit()
+
+    def _state(self, value, stored_at, now):
+        ttl = self.hit_ttl if value is not None else self.miss_ttl
+        age = now - stored_at
+        if age < ttl:
+            return FRESH
+        if age < ttl + self.stale_ttl:
+            return STALE
+        return EXPIRED
+
+    def _remember(self, key, value, stored_at):
+        self._memory[key] = (value, stored_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _flush_accessed(self):
+        # Called with the lock held; the caller commits
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE results SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._accessed.items()]
+            )
+            self._accessed.clear()
+        self._flushed_at = time.monotonic()
+
+    def get(self, key):
+        """
+        Return (state, value) for key, where state is FRESH, STALE or EXPIRED.
+        A missing entry is reported as (EXPIRED, None).
+        """
+        now = time.time()
+        with self._lock:
+            if key in self._memory:
+                value, stored_at = self._memory[key]
+                self._memory.move_to_end(key)
+                self._accessed[key] = now
+                if time.monotonic() - self._flushed_at >= self.access_flush_interval:
+                    self._flush_accessed()
+                    self._conn.commit()
+            else:
+                row = self._conn.execute(
+                    "SELECT value, stored_at FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return EXPIRED, None
+                value = json.loads(row[0]) if row[0] is not None else None
+                stored_at = row[1]
+                self._conn.execute(
+                    "UPDATE results SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self._conn.commit()
+                self._remember(key, value, stored_at)
+
+            state = self._state(value, stored_at, now)
+            if state == EXPIRED:
+                return EXPIRED, None
+            return state, value
+
+    def set(self, key, value):
+        """Store a result for key; value None records that nothing was found"""
+        now = time.time()
+        encoded = json.dumps(value) if value is not None else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, encoded, now, now)
+            )
+            self._accessed.pop(key, None)
+            self._flush_accessed()
+            # Evict the least recently used entries beyond the size limit
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN ("
+                "SELECT key FROM results ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+            self._remember(key, value, now)
+
+    def expires_at(self, key):
+        """
+        Return when the entry for key stops being fresh, or None if there is
+        no entry. Unlike get(), this does not count as a use of the entry.
+        """
+        with self._lock:
+            if key in self._memory:
+                value, stored_at = self._memory[key]
+            else:
+                row = self._conn.execute(
+                    "SELECT value IS NULL, stored_at FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                value = None if row[0] else True
+                stored_at = row[1]
+        return stored_at + (self.hit_ttl if value is not None else self.miss_ttl)
+
+    def expiring(self, before, limit):
+        """
+        Return up to limit keys whose entries stop being fresh before the
+        given time, most recently used first
+        """
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            rows = self._conn.execute(
+                "SELECT key FROM results "
+                "WHERE stored_at + CASE WHEN value IS NULL THEN ? ELSE ? END < ? "
+                "ORDER BY accessed_at DESC LIMIT ?",
+                (self.miss_ttl, self.hit_ttl, before, limit)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def popular_keys(self, n):
+        """Return the n keys requested most often since the last decay_popularity()"""
+        with self._lock:
+            return [key for key, count in self._popularity.most_common(n)]
+
+    def decay_popularity(self):
+        """Halve every request count so that popularity reflects recent requests"""
+        with self._lock:
+            self._popularity = Counter({
+                key: count // 2 for key, count in self._popularity.items() if count > 1
+            })
+
+    def _count_request(self, key):
+        with self._lock:
+            self._popularity[key] += 1
+            if len(self._popularity) > self.popularity_entries:
+                # Forget the rarely requested half rather than growing without bound
+                self._popularity = Counter(
+                    dict(self._popularity.most_common(self.popularity_entries // 2))
+                )
+
+    def clear(self):
+        """Remove every cached result"""
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+            self._memory.clear()
+            self._accessed.clear()
+            self._popularity.clear()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _refresh(self, key, fetch):
+        try:
+            self.set(key, fetch())
+        except Exception:
+            # Keep serving the stale entry; the next request will retry
+            pass
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _schedule_refresh(self, key, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="bactopedia-cache-refresh"
+                )
+        self._executor.submit(self._refresh, key, fetch)
+
+    def get_or_fetch(self, key, fetch):
+        """
+        Return the cached result for key, calling fetch() on a miss.
+
+        Stale results are returned immediately and refreshed in the
+        background. Concurrent misses for the same key share one fetch().
+        Exceptions raised by fetch() propagate to every caller sharing it
+        and are not cached.
+        """
+        state, value = self.get(key)
+        self._count_request(key)
+        METRICS.increment("bactopedia_cache_requests_total", cache="online")
+        if state == FRESH:
+            return value
+        if state == STALE:
+            METRICS.increment("bactopedia_cache_stale_total", cache="online")
+            self._schedule_refresh(key, fetch)
+            return value
+
+        METRICS.increment("bactopedia_cache_misses_total", cache="online")
+
+        def fetch_and_store():
+            value = fetch()
+            self.set(key, value)
+            return value
+
+        def recheck():
+            # Another process may have just stored it; skip this process's
+            # in-memory copy, which cannot know about that
+            with self._lock:
+                self._memory.pop(key, None)
+            state, value = self.get(key)
+            return state == FRESH, value
+
+        return self._flights.do(key, fetch_and_store, recheck)
+
+
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Return the process-wide result cache, creating it on first use"""
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache()
+        return _result_cache
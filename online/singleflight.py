@@ -0,0 +1,111 @@
+import hashlib
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from metrics import METRICS
+
+# Keys are spread over this many lock files; a collision only makes two
+# different keys wait for each other, never share a result
+_LOCK_STRIPES = 1024
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time within this process. Callers
+    arriving while a call for their key is in flight wait for it and share
+    its result, or its exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func, recheck=None):
+        """
+        Return func(), or the outcome of an identical call already in flight.
+        recheck is only used when coalescing across processes.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            METRICS.increment("bactopedia_singleflight_calls_total", role="follower")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        METRICS.increment("bactopedia_singleflight_calls_total", role="leader")
+        try:
+            call.value = self._run(key, func, recheck)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def _run(self, key, func, recheck):
+        return func()
+
+
+class FileLockSingleFlight(SingleFlight):
+    """
+    SingleFlight that also coalesces across processes sharing lock_dir.
+
+    The in-process leader takes an exclusive file lock for the key before
+    calling func. A process that had to wait for the lock calls recheck()
+    first, which returns (found, value). That lets it pick up the result
+    the other process just stored, for example in a shared cache. Errors
+    are not shared between processes, so after a failed call the next
+    process tries for itself.
+    """
+
+    def __init__(self, lock_dir):
+        super().__init__()
+        if fcntl is None:
+            raise OSError("File locks are not supported on this platform")
+        os.makedirs(lock_dir, exist_ok=True)
+        self.lock_dir = lock_dir
+
+    def _lock_path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).digest()
+        stripe = int.from_bytes(digest[:4], "big") % _LOCK_STRIPES
+        return os.path.join(self.lock_dir, f"{stripe:04d}.lock")
+
+    def _run(self, key, func, recheck):
+        with open(self._lock_path(key), "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                waited = False
+            except BlockingIOError:
+                # Another process holds the lock, most likely fetching this key
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                waited = True
+
+            try:
+                if waited and recheck is not None:
+                    found, value = recheck()
+                    if found:
+                        METRICS.increment("bactopedia_singleflight_calls_total", role="process_follower")
+                        return value
+                return func()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
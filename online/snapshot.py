@@ -0,0 +1,217 @@
+"""
+Offline snapshot packs of Wikipedia bacteria extracts.
+
+A pack answers online lookups without network access, for deployments that
+have none. Build one where Wikipedia is reachable, or from an exported
+JSON lines file of articles, and copy it to BACTOPEDIA_SNAPSHOT_PATH:
+    python -m online.snapshot --names names.txt [--output path]
+    python -m online.snapshot --articles articles.jsonl [--output path]
+
+Each line of an articles file is an object with the fields that
+display_online_info expects ("name", "description", "source", "url") and an
+optional "aliases" list.
+
+Layout of a pack file:
+    MAGIC (8 bytes) | header length (uint32, little-endian) | JSON header | key index | article blob
+
+The key index is a sorted array of fixed-size (key hash, offset, length)
+slots, one per lookup key, searched in place through mmap. Each article is
+stored once in the blob as zlib-compressed JSON, together with its keys, so
+that a hash collision can never return the wrong article.
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import zlib
+
+import config
+
+from .result_cache import cache_key
+
+MAGIC = b"BACTOSNP"
+# Bumped whenever the layout or the key normalization changes
+FORMAT_VERSION = 3
+_HEADER_LENGTH = struct.Struct("<I")
+# key hash, article offset into the blob, compressed article length
+_SLOT = struct.Struct("<QQI")
+
+
+def _key_hash(key):
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def article_keys(article, queries=()):
+    """Return the normalized keys under which an article can be looked up"""
+    keys = []
+    for name in [article["name"], *article.get("aliases", ()), *queries]:
+        key = cache_key(name)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def write_snapshot(articles, path):
+    """
+    Write (article, keys) pairs to a pack file at path and return the
+    number of articles. When several articles share a key, the first wins.
+    """
+    # Articles are spooled to a temporary file, since the index that
+    # precedes them is only known once every article has been seen
+    blob = tempfile.TemporaryFile()
+    blob_length = 0
+    slots = {}
+    count = 0
+    for article, keys in articles:
+        keys = [key for key in keys if _key_hash(key) not in slots]
+        if not keys:
+            continue
+        record = {
+            "keys": keys,
+            "article": {field: article[field] for field in ("name", "description", "source", "url")},
+        }
+        compressed = zlib.compress(json.dumps(record, ensure_ascii=False).encode("utf-8"), 9)
+        for key in keys:
+            slots[_key_hash(key)] = (blob_length, len(compressed))
+        blob.write(compressed)
+        blob_length += len(compressed)
+        count += 1
+
+    header = json.dumps({"format": FORMAT_VERSION, "articles": count, "keys": len(slots)}).encode("utf-8")
+
+    # Write to a temporary file and rename so readers never see a partial file
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f, blob:
+            f.write(MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            for key_hash in sorted(slots):
+                f.write(_SLOT.pack(key_hash, *slots[key_hash]))
+            blob.seek(0)
+            shutil.copyfileobj(blob, f)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return count
+
+
+class SnapshotPack:
+    """Read access to a snapshot pack file, safe to share between threads"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a snapshot pack")
+        (header_length,) = _HEADER_LENGTH.unpack_from(self._map, len(MAGIC))
+        header_start = len(MAGIC) + _HEADER_LENGTH.size
+        header = json.loads(self._map[header_start:header_start + header_length].decode("utf-8"))
+        if header.get("format") != FORMAT_VERSION:
+            raise ValueError(f"{path} has an unsupported snapshot format")
+
+        self._article_count = header["articles"]
+        self._slot_count = header["keys"]
+        self._index_start = header_start + header_length
+        self._blob_start = self._index_start + self._slot_count * _SLOT.size
+
+    def _find_slot(self, key_hash):
+        lo, hi = 0, self._slot_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            slot_hash, offset, length = _SLOT.unpack_from(self._map, self._index_start + mid * _SLOT.size)
+            if slot_hash < key_hash:
+                lo = mid + 1
+            elif slot_hash > key_hash:
+                hi = mid
+            else:
+                return offset, length
+        return None
+
+    def lookup(self, bacteria_name):
+        """Return the article stored for bacteria_name, or None"""
+        key = cache_key(bacteria_name)
+        slot = self._find_slot(_key_hash(key))
+        if slot is None:
+            return None
+        start = self._blob_start + slot[0]
+        record = json.loads(zlib.decompress(self._map[start:start + slot[1]]))
+        return record["article"] if key in record["keys"] else None
+
+    def __len__(self):
+        return self._article_count
+
+
+_pack = None
+_pack_path = None
+_pack_lock = threading.Lock()
+
+
+def get_snapshot(path=None):
+    """Return the pack at path (default: config.SNAPSHOT_PATH), opened on first use"""
+    global _pack, _pack_path
+    path = path or config.SNAPSHOT_PATH
+    with _pack_lock:
+        if _pack_path != path:
+            _pack = SnapshotPack(path)
+            _pack_path = path
+        return _pack
+
+
+def read_articles(path):
+    """Yield (article, keys) pairs from a JSON lines file of articles"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                article = json.loads(line)
+                yield article, article_keys(article)
+
+
+def fetch_articles(names):
+    """Yield (article, keys) pairs for the names that Wikipedia has an article for"""
+    from .wikipedia import fetch_bacteria_summary
+
+    for name in names:
+        try:
+            article = fetch_bacteria_summary(name)
+        except Exception as e:
+            print(f"Skipping {name!r}: {e}", file=sys.stderr)
+            continue
+        if article is not None:
+            yield article, article_keys(article, [name])
+
+
+def main(argv=None):
+    from .warmup import load_names
+
+    parser = argparse.ArgumentParser(description="Build an offline snapshot pack of Wikipedia extracts.")
+    parser.add_argument("--names", help="file with one bacteria name per line, fetched from Wikipedia")
+    parser.add_argument("--articles", help="JSON lines file of articles to pack")
+    parser.add_argument("--output", default=config.SNAPSHOT_PATH, help="pack file to write")
+    args = parser.parse_args(argv)
+
+    if args.articles:
+        articles = read_articles(args.articles)
+    elif args.names:
+        articles = fetch_articles(load_names(args.names))
+    else:
+        parser.error("give --names or --articles")
+
+    count = write_snapshot(articles, args.output)
+    print(f"Wrote {count} articles to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+from database.popularity import load_names
+
+from .http_client import CircuitOpenError
+from .result_cache import cache_key, get_result_cache
+from .wikipedia import fetch_bacteria_summary
+
+
+class WarmupJob:
+    """
+    Keep online results for popular names in the result cache, so that the
+    first user to ask for them does not wait for Wikipedia.
+
+    Each run resolves the configured names and the most requested online
+    names that are missing or about to go stale, then refreshes any other
+    cached entry nearing the end of its time to live. Runs happen in a
+    daemon thread, once at start and then every `interval` seconds, with
+    the lookups themselves spread over a small thread pool.
+    """
+
+    def __init__(self, names=(), cache=None, fetch=fetch_bacteria_summary, skip=None,
+                 interval=config.WARMUP_INTERVAL,
+                 recent_misses=config.WARMUP_RECENT_MISSES,
+                 refresh_ahead=config.WARMUP_REFRESH_AHEAD,
+                 max_refresh=config.WARMUP_MAX_REFRESH,
+                 concurrency=config.WARMUP_CONCURRENCY):
+        self.names = list(names)
+        self.cache = cache if cache is not None else get_result_cache()
+        self.fetch = fetch
+        # Names for which skip(name) is true (e.g. local hits) never go online
+        self.skip = skip
+        self.interval = interval
+        self.recent_misses = recent_misses
+        self.refresh_ahead = refresh_ahead
+        self.max_refresh = max_refresh
+        self.concurrency = concurrency
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def due(self):
+        """Return {key: name} for every entry the next run should fetch"""
+        deadline = time.time() + self.refresh_ahead
+        candidates = {}
+        for name in self.names + self.cache.popular_keys(self.recent_misses):
+            if self.skip is not None and self.skip(name):
+                continue
+            candidates.setdefault(cache_key(name), name)
+
+        due = {}
+        for key, name in candidates.items():
+            expires_at = self.cache.expires_at(key)
+            if expires_at is None or expires_at < deadline:
+                due[key] = name
+        for key in self.cache.expiring(deadline, self.max_refresh):
+            due.setdefault(key, key)
+        return dict(list(due.items())[:self.max_refresh])
+
+    def run_once(self):
+        """Fetch every due entry into the cache and return how many were stored"""
+        abandoned = threading.Event()
+
+        def refresh(key, name):
+            if self._stop.is_set() or abandoned.is_set():
+                return False
+            try:
+                self.cache.set(key, self.fetch(name))
+                return True
+            except CircuitOpenError:
+                # Wikipedia is failing; leave the remaining names for the next run
+                abandoned.set()
+            except Exception:
+                pass
+            return False
+
+        due = self.due()
+        refreshed = 0
+        if due:
+            with ThreadPoolExecutor(max_workers=self.concurrency,
+                                    thread_name_prefix="bactopedia-warmup") as executor:
+                refreshed = sum(executor.map(refresh, due.keys(), due.values()))
+        self.cache.decay_popularity()
+        return refreshed
+
+    def _run_forever(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                # A failed run (e.g. a locked cache database) must not end the schedule
+                pass
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the periodic runs in a daemon thread; returns immediately"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run_forever, name="bactopedia-warmup", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+_warmup_job = None
+_warmup_job_lock = threading.Lock()
+
+
+def start_warmup(skip=None):
+    """
+    Start the process-wide warm-up job with the configured names, unless
+    warm-up is disabled. Returns the job, or None when disabled.
+    """
+    global _warmup_job
+    # Offline deployments answer from the snapshot pack, which needs no warming
+    if not config.WARMUP_ENABLED or config.ONLINE_MODE == "offline":
+        return None
+    with _warmup_job_lock:
+        if _warmup_job is None:
+            _warmup_job = WarmupJob(load_names(config.WARMUP_NAMES_PATH), skip=skip).start()
+        return _warmup_job
@@ -0,0 +1,77 @@
+import config
+
+from .http_client import get_http_client
+from .result_cache import cache_key, get_result_cache
+
+# Words that show an article is actually about a microorganism
+BACTERIA_INDICATORS = [
+    'bacteria', 'bacterium', 'gram-positive', 'gram-negative',
+    'species', 'genus', 'pathogen', 'microorganism',
+    'strain', 'culture', 'colony'
+]
+
+
+def is_bacteria_article(extract):
+    """Check if an article extract appears to describe bacteria"""
+    content_lower = extract.lower()
+    return any(indicator in content_lower for indicator in BACTERIA_INDICATORS)
+
+
+def fetch_bacteria_summary(bacteria_name, client=None):
+    """
+    Fetch bacteria information from the Wikipedia API, bypassing the cache.
+
+    A single generator=search request returns the intro extracts of the top
+    search candidates; the first bacteria-related one in search order wins.
+    Returns None when no candidate is about bacteria.
+    """
+    client = client or get_http_client()
+
+    # Add "bacteria" to the search query if it's not already present
+    search_term = bacteria_name
+    if "bacteria" not in bacteria_name.lower():
+        search_term = f"{bacteria_name} bacteria"
+
+    params = {
+        "action": "query",
+        "format": "json",
+        "generator": "search",
+        "gsrsearch": search_term,
+        "gsrlimit": config.WIKIPEDIA_SEARCH_LIMIT,
+        "prop": "extracts|info",
+        "exintro": 1,
+        "explaintext": 1,
+        "exlimit": config.WIKIPEDIA_SEARCH_LIMIT,
+        "inprop": "url",
+        "utf8": 1
+    }
+    data = client.get_json(config.WIKIPEDIA_API_URL, params=params)
+
+    pages = data.get("query", {}).get("pages", {})
+    # Pages come back keyed by id; "index" is their position in the search results
+    for page in sorted(pages.values(), key=lambda page: page.get("index", 0)):
+        extract = page.get("extract", "")
+        if extract.strip() and is_bacteria_article(extract):
+            page_id = page.get("pageid")
+            return {
+                "name": page.get("title", bacteria_name.title()),
+                "description": extract,
+                "source": "Wikipedia",
+                "url": page.get("fullurl", f"https://en.wikipedia.org/?curid={page_id}")
+            }
+    return None
+
+
+def lookup_bacteria_online(bacteria_name):
+    """
+    Return Wikipedia information for bacteria_name through the result cache.
+    Network errors propagate to the caller and are not cached. In offline
+    mode the snapshot pack answers instead, and the network is never used.
+    """
+    if config.ONLINE_MODE == "offline":
+        from .snapshot import get_snapshot
+        return get_snapshot().lookup(bacteria_name)
+    return get_result_cache().get_or_fetch(
+        cache_key(bacteria_name),
+        lambda: fetch_bacteria_summary(bacteria_name)
+    )
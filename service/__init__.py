@@ -0,0 +1,2 @@
+from .app import create_app
+from .server import preload, serve
@@ -0,0 +1,33 @@
+"""
+Run the headless lookup service.
+
+Usage:
+    python -m service [--host 127.0.0.1] [--port 8080] [--workers N]
+
+Endpoints:
+    GET  /lookup?q=<name>     resolve one name through every lookup stage
+    GET  /suggest?q=<name>    validate a name and suggest similar known names
+    GET  /complete?q=<prefix> autocomplete a partially typed name
+    POST /batch               {"names": [...]}, streamed back as JSON lines
+    GET  /metrics             Prometheus metrics of the answering worker
+    GET  /health
+"""
+import argparse
+
+import config
+
+from .server import serve
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve BACTO_PEDIA lookups over HTTP.")
+    parser.add_argument("--host", default=config.SERVICE_HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=config.SERVICE_PORT, help="port to listen on (0 for any)")
+    parser.add_argument("--workers", type=int, default=config.SERVICE_WORKERS,
+                        help="worker processes sharing the listening socket")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+import config
+from batch_lookup import resolve_many
+from core import (
+    STAGE_FULLTEXT,
+    STAGE_LOCAL,
+    STAGE_ONLINE,
+    STAGE_VALIDATION,
+    complete_bacteria,
+    get_bacteria_info,
+    get_similar_bacteria,
+    resolve_bacteria,
+    validate_input
+)
+from metrics import METRICS
+from online import get_http_client, get_result_cache, start_warmup
+
+EXECUTOR = web.AppKey("executor", ThreadPoolExecutor)
+
+FOUND_STAGES = (STAGE_LOCAL, STAGE_FULLTEXT, STAGE_ONLINE)
+
+
+def _query_parameter(request, strip=True):
+    query = request.query.get("q", "")
+    if strip:
+        query = query.strip()
+    if not query.strip():
+        raise web.HTTPBadRequest(
+            text=json.dumps({"error": "Missing query parameter 'q'"}),
+            content_type="application/json"
+        )
+    return query
+
+
+async def _run(request, func, *args):
+    # Lookups may block on the network, so they never run on the event loop
+    return await request.loop.run_in_executor(request.app[EXECUTOR], func, *args)
+
+
+async def handle_lookup(request):
+    """
+    GET /lookup?q=<name>: resolve one name through every lookup stage.
+
+    Responds 200 when bacteria information was found, 400 for malformed
+    names, 502 when the online search failed and 404 otherwise.
+    """
+    query = _query_parameter(request)
+    result = await _run(request, resolve_bacteria, query)
+
+    if result.stage in FOUND_STAGES:
+        status = 200
+    elif result.stage == STAGE_VALIDATION:
+        status = 400
+    elif result.online_error:
+        status = 502
+    else:
+        status = 404
+
+    return web.json_response({
+        "query": query,
+        "stage": result.stage,
+        "info": dict(result.info) if result.info is not None else None,
+        "error": result.error,
+        "online_error": result.online_error,
+    }, status=status)
+
+
+async def handle_suggest(request):
+    """GET /suggest?q=<name>: validate a name and suggest similar known names"""
+    query = _query_parameter(request)
+
+    def suggest():
+        return validate_input(query), get_similar_bacteria(query)
+
+    (is_valid, message), suggestions = await _run(request, suggest)
+    return web.json_response({
+        "query": query,
+        "valid": is_valid,
+        "message": message,
+        "suggestions": suggestions,
+    })
+
+
+async def handle_complete(request):
+    """
+    GET /complete?q=<prefix>[&n=5]: autocomplete a partially typed name.
+    Served straight from the prefix index, without a thread hop.
+    """
+    # A trailing space is meaningful: "staphylococcus " wants the species
+    query = _query_parameter(request, strip=False)
+    try:
+        n = min(int(request.query.get("n", 5)), 50)
+    except ValueError:
+        raise web.HTTPBadRequest(
+            text=json.dumps({"error": "n must be an integer"}),
+            content_type="application/json"
+        )
+
+    return web.json_response({
+        "query": query,
+        "completions": [
+            {"completion": completion, "name": entry["name"]}
+            for completion, entry in complete_bacteria(query, n=n)
+        ],
+    })
+
+
+async def handle_batch(request):
+    """
+    POST /batch with {"names": [...]}: resolve many names, streaming one JSON
+    line per name as soon as it is known (see batch_lookup.resolve_many).
+    """
+    try:
+        body = await request.json()
+    except ValueError:
+        raise web.HTTPBadRequest(
+            text=json.dumps({"error": "Request body must be JSON"}),
+            content_type="application/json"
+        )
+
+    names = body.get("names") if isinstance(body, dict) else None
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        raise web.HTTPBadRequest(
+            text=json.dumps({"error": "Expected {\"names\": [\"...\", ...]}"}),
+            content_type="application/json"
+        )
+    if len(names) > config.SERVICE_MAX_BATCH:
+        raise web.HTTPRequestEntityTooLarge(
+            max_size=config.SERVICE_MAX_BATCH,
+            actual_size=len(names),
+            text=json.dumps({"error": f"At most {config.SERVICE_MAX_BATCH} names per batch"}),
+            content_type="application/json"
+        )
+
+    response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+    await response.prepare(request)
+    async for result in resolve_many(names, executor=request.app[EXECUTOR]):
+        await response.write((json.dumps(result) + "\n").encode("utf-8"))
+    await response.write_eof()
+    return response
+
+
+async def handle_metrics(request):
+    """GET /metrics: this worker's metrics in the Prometheus text format"""
+    return web.Response(text=METRICS.export_prometheus(), content_type="text/plain")
+
+
+async def handle_health(request):
+    return web.json_response({"status": "ok"})
+
+
+async def _start_resources(app):
+    app[EXECUTOR] = ThreadPoolExecutor(
+        max_workers=config.SERVICE_THREADS, thread_name_prefix="bactopedia-service"
+    )
+    # Created here rather than at import so that every worker process gets
+    # its own connection pool and database connection
+    get_http_client()
+    get_result_cache()
+
+
+async def _stop_resources(app):
+    app[EXECUTOR].shutdown(wait=False, cancel_futures=True)
+
+
+async def _start_warmup(app):
+    start_warmup(skip=get_bacteria_info)
+
+
+def create_app(warmup=True):
+    """
+    Build the aiohttp application serving the lookup endpoints. With warmup,
+    the worker also keeps popular online results cached in the background.
+    """
+    app = web.Application()
+    app.add_routes([
+        web.get("/lookup", handle_lookup),
+        web.get("/suggest", handle_suggest),
+        web.get("/complete", handle_complete),
+        web.post("/batch", handle_batch),
+        web.get("/metrics", handle_metrics),
+        web.get("/health", handle_health),
+    ])
+    app.on_startup.append(_start_resources)
+    if warmup:
+        app.on_startup.append(_start_warmup)
+    app.on_cleanup.append(_stop_resources)
+    return app
@@ -0,0 +1,71 @@
+import gc
+import os
+import signal
+import socket
+import sys
+
+from aiohttp import web
+
+import config
+from database import BACTERIA_INDEXES
+
+from .app import create_app
+
+
+def preload():
+    """
+    Build every index up front. With several workers this happens once in
+    the parent, and the forked workers share the pages copy-on-write.
+    """
+    BACTERIA_INDEXES.build_all()
+    # Keep the collector from touching (and so copying) the shared objects
+    gc.freeze()
+
+
+def _run_worker(sock, warmup):
+    web.run_app(create_app(warmup=warmup), sock=sock, print=None)
+
+
+def serve(host=config.SERVICE_HOST, port=config.SERVICE_PORT, workers=config.SERVICE_WORKERS):
+    """
+    Serve the lookup endpoints on host:port with the given number of worker
+    processes accepting connections from one shared listening socket
+    """
+    preload()
+    sock = socket.create_server((host, port), backlog=1024)
+    print(f"Serving BACTO_PEDIA on http://{host}:{sock.getsockname()[1]} "
+          f"with {workers} worker(s)", file=sys.stderr)
+
+    if workers <= 1 or not hasattr(os, "fork"):
+        _run_worker(sock, warmup=True)
+        return
+
+    children = []
+    for worker in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                # The workers share the cache database, so one warm-up is enough
+                _run_worker(sock, warmup=worker == 0)
+            except BaseException:
+                code = 1
+            finally:
+                os._exit(code)
+        children.append(pid)
+    sock.close()
+
+    def stop_children(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop_children)
+    signal.signal(signal.SIGINT, stop_children)
+    for pid in children:
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
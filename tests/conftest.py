@@ -0,0 +1,43 @@
+import os
+
+# Tests never touch the user's cache, the real Wikipedia or the background
+# warm-up; set before config is first imported
+os.environ.update(
+    BACTOPEDIA_CACHE_PATH=":memory:",
+    BACTOPEDIA_WIKIPEDIA_API_URL="http://127.0.0.1:9/w/api.php",
+    BACTOPEDIA_WARMUP="0",
+)
+
+import pytest
+
+import config
+from benchmarks.fake_wikipedia import FakeWikipedia
+
+
+class FakeClock:
+    """Stand-in for the time module whose time only moves when advanced"""
+
+    def __init__(self, start=1_000_000.0):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def fake_wikipedia(monkeypatch):
+    """A running FakeWikipedia that online lookups are pointed at"""
+    with FakeWikipedia() as wiki:
+        monkeypatch.setattr(config, "WIKIPEDIA_API_URL", wiki.url)
+        yield wiki
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
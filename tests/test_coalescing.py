@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+import requests
+
+from benchmarks import coalescing
+from online.http_client import CircuitBreaker, HttpClient
+from online.result_cache import ResultCache
+from online.wikipedia import fetch_bacteria_summary
+
+CALLERS = 16
+
+
+def _concurrent_lookups(cache, fetch):
+    barrier = threading.Barrier(CALLERS)
+    outcomes = [None] * CALLERS
+
+    def lookup(index):
+        barrier.wait()
+        try:
+            outcomes[index] = cache.get_or_fetch("trendia", fetch)
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=lookup, args=(index,)) for index in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def _fetch(client):
+    return lambda: fetch_bacteria_summary("Trendia", client=client)
+
+
+def test_concurrent_threads_share_one_fetch(fake_wikipedia):
+    fake_wikipedia.latency = 0.3
+    cache = ResultCache(":memory:", coalescing="thread")
+
+    outcomes = _concurrent_lookups(cache, _fetch(HttpClient(max_retries=0)))
+    assert fake_wikipedia.hits == 1
+    assert all(outcome == outcomes[0] for outcome in outcomes)
+    assert outcomes[0]["name"] == "Trendia"
+
+
+def test_concurrent_threads_share_one_error(fake_wikipedia):
+    fake_wikipedia.latency = 0.3
+    fake_wikipedia.status = 503
+    cache = ResultCache(":memory:", coalescing="thread")
+    client = HttpClient(max_retries=0, circuit_breaker=CircuitBreaker(failure_threshold=100))
+
+    outcomes = _concurrent_lookups(cache, _fetch(client))
+    assert fake_wikipedia.hits == 1
+    assert all(isinstance(outcome, requests.HTTPError) for outcome in outcomes)
+    # Errors are not cached, so the next lookup tries again
+    fake_wikipedia.status = 200
+    assert cache.get_or_fetch("trendia", _fetch(client))["name"] == "Trendia"
+    assert fake_wikipedia.hits == 2
+
+
+@pytest.mark.parametrize("mode, expected_requests", [("thread", 2), ("process", 1)])
+def test_processes_sharing_a_cache_file(monkeypatch, mode, expected_requests):
+    # run() points the lookup processes at its fake server through the environment
+    for name in ("BACTOPEDIA_WIKIPEDIA_API_URL", "BACTOPEDIA_CACHE_PATH",
+                 "BACTOPEDIA_CACHE_COALESCING", "BACTOPEDIA_WARMUP"):
+        monkeypatch.setenv(name, "")
+
+    result = coalescing.run(mode, processes=2, threads=4, names=["Trendia"], latency=0.5)
+    assert result["callers"] == 8
+    assert result["upstream_requests"] <= expected_requests
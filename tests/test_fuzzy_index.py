@@ -0,0 +1,77 @@
+import random
+import string
+from difflib import get_close_matches
+
+import pytest
+
+from benchmarks.synthetic import generate_catalog
+from database import FuzzyIndex, ShardedIndex
+
+
+def _misspell(rng, name):
+    position = rng.randrange(len(name))
+    operation = rng.randrange(4)
+    if operation == 0:
+        return name[:position] + name[position + 1:]
+    if operation == 1:
+        return name[:position] + rng.choice(string.ascii_lowercase) + name[position:]
+    if operation == 2:
+        return name[:position] + rng.choice(string.ascii_lowercase) + name[position + 1:]
+    # Swapping two inner letters breaks several bigrams but keeps a high ratio
+    position = min(position, len(name) - 2)
+    return name[:position] + name[position + 1] + name[position] + name[position + 2:]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    # Several hundred names, most of which a query never has to score
+    return generate_catalog(90, seed=7)
+
+
+@pytest.fixture(scope="module")
+def names(catalog):
+    names = []
+    for key, info in catalog.items():
+        names.append(key)
+        names.extend(info["common_names"])
+    return names
+
+
+@pytest.fixture(scope="module")
+def queries(names):
+    rng = random.Random(7)
+    queries = [_misspell(rng, rng.choice(names)) for _ in range(150)]
+    queries += ["".join(rng.choices(string.ascii_lowercase + " ", k=rng.randint(3, 20))) for _ in range(30)]
+    return queries + ["", "a", "zzzz", names[0]]
+
+
+@pytest.mark.parametrize("n, cutoff", [(3, 0.6), (1, 0.8), (5, 0.3)])
+def test_suggestions_match_get_close_matches(names, queries, n, cutoff):
+    assert len(names) > 256
+    index = FuzzyIndex(names)
+    for query in queries:
+        expected = get_close_matches(query, names, n=n, cutoff=cutoff)
+        assert [name for name, score in index.suggest(query, n=n, cutoff=cutoff)] == expected, query
+
+
+def test_names_are_scored_in_lowercase_and_suggested_as_written():
+    index = FuzzyIndex(["Vibrio cholerae", "vibrio", "E. coli", "e. coli"])
+    assert index.suggest("vibrio cholera", n=1) == [("Vibrio cholerae", pytest.approx(28 / 29))]
+    # Repeated names are suggested once per occurrence, as difflib does
+    assert [name for name, score in FuzzyIndex(["ecoli", "ecoli", "e. coli"]).suggest("ecolli")] == [
+        "ecoli", "ecoli", "e. coli"
+    ]
+
+
+def test_sharded_suggestions_match_single_process(catalog, names, queries):
+    index = FuzzyIndex.from_database(catalog)
+    with ShardedIndex(catalog, processes=0, shards=4) as sharded:
+        assert sharded.suggest_many(queries) == [index.suggest(query) for query in queries]
+
+
+def test_suggest_rejects_the_arguments_difflib_rejects():
+    index = FuzzyIndex(["vibrio"])
+    with pytest.raises(ValueError):
+        index.suggest("vibrio", n=0)
+    with pytest.raises(ValueError):
+        index.suggest("vibrio", cutoff=1.5)
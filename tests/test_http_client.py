@@ -0,0 +1,98 @@
+import time
+
+import pytest
+import requests
+
+import config
+from online.http_client import CircuitBreaker, CircuitOpenError, HttpClient
+
+
+def _client(failure_threshold=10, reset_timeout=30.0, **kwargs):
+    kwargs.setdefault("backoff_factor", 0)
+    breaker = CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+    return HttpClient(circuit_breaker=breaker, **kwargs)
+
+
+def test_successful_request_reuses_the_connection(fake_wikipedia):
+    client = _client()
+    for _ in range(3):
+        data = client.get_json(config.WIKIPEDIA_API_URL, params={"gsrsearch": "vibrio"})
+        assert data["query"]["pages"]["1"]["title"] == "Vibrio"
+    assert fake_wikipedia.hits == 3
+    assert not client.circuit_breaker.is_open
+
+
+def test_read_timeout_is_not_retried(fake_wikipedia):
+    fake_wikipedia.latency = 1.0
+    client = _client(read_timeout=0.2, max_retries=2)
+
+    started = time.monotonic()
+    with pytest.raises(requests.Timeout):
+        client.get_json(config.WIKIPEDIA_API_URL)
+    assert time.monotonic() - started < 0.9
+    assert fake_wikipedia.hits == 1
+    assert client.circuit_breaker._failures == 1
+
+
+def test_server_errors_are_retried_and_each_attempt_counts(fake_wikipedia):
+    fake_wikipedia.status = 503
+    client = _client(max_retries=2)
+
+    with pytest.raises(requests.HTTPError):
+        client.get_json(config.WIKIPEDIA_API_URL)
+    assert fake_wikipedia.hits == 3
+    assert client.circuit_breaker._failures == 3
+
+
+def test_connection_errors_are_retried():
+    client = _client(max_retries=2)
+
+    with pytest.raises(requests.ConnectionError):
+        client.get_json("http://127.0.0.1:9/w/api.php")
+    assert client.circuit_breaker._failures == 3
+
+
+def test_circuit_opens_and_skips_the_network(fake_wikipedia):
+    fake_wikipedia.status = 503
+    client = _client(failure_threshold=2, max_retries=0)
+
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            client.get_json(config.WIKIPEDIA_API_URL)
+    assert client.circuit_breaker.is_open
+
+    with pytest.raises(CircuitOpenError):
+        client.get_json(config.WIKIPEDIA_API_URL)
+    assert fake_wikipedia.hits == 2
+
+
+def test_half_open_trial_success_closes_the_circuit(fake_wikipedia):
+    fake_wikipedia.status = 503
+    client = _client(failure_threshold=1, reset_timeout=0.2, max_retries=0)
+    with pytest.raises(requests.HTTPError):
+        client.get_json(config.WIKIPEDIA_API_URL)
+
+    fake_wikipedia.status = 200
+    with pytest.raises(CircuitOpenError):
+        client.get_json(config.WIKIPEDIA_API_URL)
+
+    time.sleep(0.25)
+    client.get_json(config.WIKIPEDIA_API_URL)
+    assert not client.circuit_breaker.is_open
+    assert fake_wikipedia.hits == 2
+
+
+def test_half_open_trial_failure_reopens_the_circuit(fake_wikipedia):
+    fake_wikipedia.status = 503
+    client = _client(failure_threshold=1, reset_timeout=0.2, max_retries=0)
+    with pytest.raises(requests.HTTPError):
+        client.get_json(config.WIKIPEDIA_API_URL)
+
+    time.sleep(0.25)
+    with pytest.raises(requests.HTTPError):
+        client.get_json(config.WIKIPEDIA_API_URL)
+    assert client.circuit_breaker.is_open
+
+    with pytest.raises(CircuitOpenError):
+        client.get_json(config.WIKIPEDIA_API_URL)
+    assert fake_wikipedia.hits == 2
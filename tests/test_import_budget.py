@@ -0,0 +1,7 @@
+from benchmarks.import_budget import check_deferred
+
+
+def test_core_import_defers_network_fuzzy_and_ui_modules():
+    # The time budget depends on the machine, so only
+    # `python -m benchmarks.import_budget` checks it
+    assert check_deferred("core") == []
@@ -0,0 +1,59 @@
+import pytest
+
+import core
+from database.query_classifier import NOT_BACTERIA_MESSAGE
+from online import get_result_cache
+
+
+@pytest.mark.parametrize("query, stage", [
+    ("hello123", core.STAGE_VALIDATION),
+    ("!!!", core.STAGE_VALIDATION),
+    ("stapylococcus aureus", core.STAGE_FUZZY),
+])
+def test_rejected_and_misspelled_queries_never_go_online(fake_wikipedia, query, stage):
+    result = core.resolve_bacteria(query)
+    assert result.stage == stage
+    assert result.info is None
+    assert result.error
+    assert fake_wikipedia.hits == 0
+
+
+def test_known_abbreviation_is_answered_locally(fake_wikipedia):
+    result = core.resolve_bacteria("E. coli")
+    assert result.stage == core.STAGE_LOCAL
+    assert result.info["name"] == "Escherichia coli"
+    assert fake_wikipedia.hits == 0
+
+
+def test_genus_missing_locally_is_found_online(fake_wikipedia):
+    get_result_cache().clear()
+    result = core.resolve_bacteria("Salmonella")
+    assert result.stage == core.STAGE_ONLINE
+    assert result.info is not None
+    assert fake_wikipedia.hits >= 1
+
+
+def test_abbreviated_name_missing_online_is_not_called_unrelated(fake_wikipedia):
+    get_result_cache().clear()
+    # The fake server finds nothing for names containing "unknown"
+    result = core.resolve_bacteria("S.unknownia")
+    assert result.stage == core.STAGE_NOT_FOUND
+    assert result.error != NOT_BACTERIA_MESSAGE
+    assert fake_wikipedia.hits >= 1
+
+
+def test_wikipedia_is_searched_for_the_query_as_typed(fake_wikipedia):
+    get_result_cache().clear()
+    result = core.resolve_bacteria("S.enterica")
+    assert result.stage == core.STAGE_ONLINE
+    # The fake server titles its article after the search term
+    assert result.info["name"] == "S.Enterica"
+
+
+@pytest.mark.parametrize("query", ["K. pneumoniae", "K pneumoniae", "Kpneumoniae"])
+def test_other_genus_with_a_known_epithet_is_searched_online(fake_wikipedia, query):
+    # Close to "s. pneumoniae", but Klebsiella is not a misspelling of it
+    get_result_cache().clear()
+    result = core.resolve_bacteria(query)
+    assert result.stage == core.STAGE_ONLINE
+    assert fake_wikipedia.hits >= 1
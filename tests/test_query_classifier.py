@@ -0,0 +1,15 @@
+import pytest
+
+import core
+from database.query_classifier import NOT_BACTERIA_MESSAGE
+
+
+@pytest.mark.parametrize("query", ["S.enterica", "K.pneumoniae", "S. enterica", "Salmonella enterica"])
+def test_abbreviated_and_binomial_names_are_accepted(query):
+    assert core.is_bacteria_related(query)
+    assert core.validate_input(query) == (True, None)
+
+
+def test_unrelated_words_are_rejected():
+    assert not core.is_bacteria_related("pizza")
+    assert core.validate_input("pizza") == (False, NOT_BACTERIA_MESSAGE)
@@ -0,0 +1,108 @@
+import pytest
+
+from online import result_cache
+from online.http_client import HttpClient
+from online.result_cache import EXPIRED, FRESH, STALE, ResultCache
+from online.wikipedia import fetch_bacteria_summary
+
+
+@pytest.fixture
+def cache(monkeypatch, clock):
+    monkeypatch.setattr(result_cache, "time", clock)
+    cache = ResultCache(":memory:", max_entries=3, hit_ttl=100, miss_ttl=10, stale_ttl=50)
+    yield cache
+    if cache._executor is not None:
+        cache._executor.shutdown(wait=True)
+
+
+def _keys(cache):
+    return sorted(row[0] for row in cache._conn.execute("SELECT key FROM results"))
+
+
+def test_hit_is_fresh_then_stale_then_expired(cache, clock):
+    cache.set("vibrio", {"name": "Vibrio"})
+    assert cache.get("vibrio") == (FRESH, {"name": "Vibrio"})
+
+    clock.advance(120)
+    assert cache.get("vibrio") == (STALE, {"name": "Vibrio"})
+
+    clock.advance(40)
+    assert cache.get("vibrio") == (EXPIRED, None)
+
+
+def test_miss_uses_its_own_ttl(cache, clock):
+    cache.set("nothing", None)
+    assert cache.get("nothing") == (FRESH, None)
+
+    clock.advance(11)
+    assert cache.get("nothing") == (STALE, None)
+
+    clock.advance(50)
+    assert cache.get("nothing") == (EXPIRED, None)
+
+
+def test_missing_key_is_expired(cache):
+    assert cache.get("absent") == (EXPIRED, None)
+
+
+def test_least_recently_used_entry_is_evicted(cache, clock):
+    for key in ("a", "b", "c"):
+        cache.set(key, {"name": key})
+        clock.advance(1)
+    cache.get("a")
+    clock.advance(1)
+
+    cache.set("d", {"name": "d"})
+    assert _keys(cache) == ["a", "c", "d"]
+
+
+def test_memory_hits_count_as_uses_for_eviction(cache, clock):
+    for key in ("a", "b", "c"):
+        cache.set(key, {"name": key})
+        clock.advance(1)
+    # Every read of "a" is served by the in-memory layer
+    for _ in range(100):
+        assert cache.get("a")[0] == FRESH
+        clock.advance(0.01)
+
+    cache.set("d", {"name": "d"})
+    assert _keys(cache) == ["a", "c", "d"]
+
+
+def test_memory_hits_order_expiring_entries(cache, clock):
+    cache.set("a", {"name": "a"})
+    clock.advance(1)
+    cache.set("b", {"name": "b"})
+    clock.advance(1)
+    cache.get("a")
+
+    assert cache.expiring(clock.time() + 1000, 10) == ["a", "b"]
+
+
+def test_stale_entry_is_served_and_refreshed_in_background(cache, clock, fake_wikipedia):
+    client = HttpClient(max_retries=0)
+
+    def fetch():
+        return fetch_bacteria_summary("vibrio", client=client)
+
+    first = cache.get_or_fetch("vibrio", fetch)
+    assert first["name"] == "Vibrio"
+    assert cache.get_or_fetch("vibrio", fetch) == first
+    assert fake_wikipedia.hits == 1
+
+    clock.advance(120)
+    assert cache.get_or_fetch("vibrio", fetch) == first
+    cache._executor.shutdown(wait=True)
+    assert fake_wikipedia.hits == 2
+    assert cache.get("vibrio")[0] == FRESH
+
+
+def test_not_found_answers_are_cached(cache, fake_wikipedia):
+    client = HttpClient(max_retries=0)
+
+    def fetch():
+        return fetch_bacteria_summary("unknownia", client=client)
+
+    assert cache.get_or_fetch("unknownia", fetch) is None
+    assert cache.get_or_fetch("unknownia", fetch) is None
+    assert fake_wikipedia.hits == 1
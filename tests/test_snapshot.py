@@ -0,0 +1,74 @@
+import pytest
+
+import config
+import core
+from online import lookup_bacteria_online
+from online.snapshot import SnapshotPack, article_keys, write_snapshot
+
+ARTICLES = [
+    {
+        "name": "Listeria monocytogenes",
+        "description": "Listeria monocytogenes is a species of pathogenic bacteria.",
+        "source": "Wikipedia",
+        "url": "https://en.wikipedia.org/wiki/Listeria_monocytogenes",
+        "aliases": ["listeria"],
+    },
+    {
+        "name": "Yersinia pestis",
+        "description": "Yersinia pestis is a Gram-negative bacterium that causes plague.",
+        "source": "Wikipedia",
+        "url": "https://en.wikipedia.org/wiki/Yersinia_pestis",
+        "aliases": ["plague bacterium"],
+    },
+]
+
+
+def _displayed(article):
+    return {field: article[field] for field in ("name", "description", "source", "url")}
+
+
+@pytest.fixture
+def offline(monkeypatch, tmp_path, fake_wikipedia):
+    """Offline mode over a fixture pack; the fake server must never be asked"""
+    path = str(tmp_path / "fixture.snapshot")
+    write_snapshot(((article, article_keys(article)) for article in ARTICLES), path)
+    monkeypatch.setattr(config, "ONLINE_MODE", "offline")
+    monkeypatch.setattr(config, "SNAPSHOT_PATH", path)
+    yield path
+    assert fake_wikipedia.hits == 0
+
+
+def test_pack_answers_names_and_aliases(offline):
+    assert lookup_bacteria_online("Listeria monocytogenes") == _displayed(ARTICLES[0])
+    assert lookup_bacteria_online("LISTERIA") == _displayed(ARTICLES[0])
+    assert lookup_bacteria_online("plague  bacterium") == _displayed(ARTICLES[1])
+
+
+def test_pack_misses_are_not_found(offline):
+    assert lookup_bacteria_online("Zzunknownia bac") is None
+    result = core.resolve_bacteria("Zzunknownia bac")
+    assert result.stage == core.STAGE_NOT_FOUND
+    assert result.online_error is None
+
+
+def test_resolver_answers_local_misses_from_the_pack(offline):
+    result = core.resolve_bacteria("Yersinia pestis")
+    assert result.stage == core.STAGE_ONLINE
+    assert result.info == _displayed(ARTICLES[1])
+
+
+def test_first_article_claims_a_shared_key(tmp_path):
+    path = str(tmp_path / "shared.snapshot")
+    second = dict(ARTICLES[1], aliases=["listeria"])
+    assert write_snapshot(((article, article_keys(article)) for article in [ARTICLES[0], second]), path) == 2
+
+    pack = SnapshotPack(path)
+    assert len(pack) == 2
+    assert pack.lookup("listeria")["name"] == "Listeria monocytogenes"
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "not.snapshot"
+    path.write_bytes(b"NOTAPACK" + b"\0" * 16)
+    with pytest.raises(ValueError):
+        SnapshotPack(str(path))